@@ -1,9 +1,15 @@
 # idea_radar.py (Fixed for openai>=1.0.0 API)
 
-import praw
 from datetime import datetime
 import os
-import openai
+import io
+import re
+import json
+import asyncio
+import threading
+import argparse
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
 # === Reddit Credentials ===
 REDDIT_CLIENT_ID = "VUQT-RvwOD3W-6s0R3qxGw"
@@ -14,10 +20,21 @@ REDDIT_PASSWORD = "RedditPass@01"
 
 # === OpenAI Key ===
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("❌ OPENAI_API_KEY is not set. Please export it in your shell or hardcode for local test.")
 
-openai.api_key = OPENAI_API_KEY
+# 全局复用同一个客户端，HTTPX连接池可在多次调用间保持keep-alive连接；首次使用时才创建
+_OPENAI_CLIENT = None
+
+def _require_openai_key():
+    if not OPENAI_API_KEY:
+        raise ValueError("❌ OPENAI_API_KEY is not set. Please export it in your shell or hardcode for local test.")
+    return OPENAI_API_KEY
+
+def _get_openai_client():
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        import openai
+        _OPENAI_CLIENT = openai.OpenAI(api_key=_require_openai_key())
+    return _OPENAI_CLIENT
 
 # === Search Scope ===
 KEYWORDS = [
@@ -31,50 +48,196 @@ KEYWORDS = [
 ]
 SUBREDDITS = ["macapps", "iphone", "chrome_extensions"]
 
-print("🔐 Authenticating Reddit account...")
-reddit = praw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    user_agent=REDDIT_USER_AGENT,
-    username=REDDIT_USERNAME,
-    password=REDDIT_PASSWORD
+# Reddit客户端延迟到真正搜索时才创建和登录，import本模块不会触发网络请求
+_REDDIT = None
+
+# PRAW的Reddit实例不是线程安全的，搜索线程各自持有一个实例
+_THREAD_LOCAL = threading.local()
+
+def _new_reddit():
+    import praw
+    return praw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT,
+        username=REDDIT_USERNAME,
+        password=REDDIT_PASSWORD
+    )
+
+def _init_reddit():
+    global _REDDIT
+    if _REDDIT is None:
+        print("🔐 Authenticating Reddit account...")
+        reddit = _new_reddit()
+
+        try:
+            me = reddit.user.me()
+            print(f"✅ Authenticated as: u/{me}")
+        except Exception as e:
+            print("❌ Reddit authentication failed:", e)
+            exit(1)
+        _REDDIT = reddit
+    return _REDDIT
+
+# === GPT结构化输出 ===
+# 通过json_schema约束模型直接返回合法JSON对象，下游按字段读取即可，无需再做字符串匹配
+GPT_MODEL = "gpt-4o-mini"  # gpt-3.5-turbo 不支持 json_schema 结构化输出
+IDEA_EVAL_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "idea_eval",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "unmet_need": {"type": "boolean"},
+                "pain_summary": {"type": "string"},
+                "alternatives": {"type": "string"},
+                "solo_doable": {"type": "boolean"},
+                "monetizable": {"type": "boolean"},
+                "tags": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["unmet_need", "pain_summary", "alternatives", "solo_doable", "monetizable", "tags"],
+            "additionalProperties": False
+        }
+    }
+}
+
+_PROMPT_TMPL = (
+    'Reddit post: "{title}"\n'
+    'Subreddit: {subreddit}\n'
+    'URL: {url}\n\n'
+    'Assess: unmet need? pain point, existing tools, solo-dev buildable? would users pay? '
+    'tags (e.g. macOS, productivity, calendar).'
 )
 
-try:
-    me = reddit.user.me()
-    print(f"✅ Authenticated as: u/{me}")
-except Exception as e:
-    print("❌ Reddit authentication failed:", e)
-    exit(1)
+def _build_prompt(title, subreddit, url):
+    return _PROMPT_TMPL.format_map({'title': title, 'subreddit': subreddit, 'url': url})
 
 def analyze_post_with_gpt(title, subreddit, url):
-    prompt = f"""
-Reddit Post Title:
-"{title}"
-Subreddit: {subreddit}
-URL: {url}
-
-Please analyze the post. Return JSON with the following fields:
-- unmet_need: true/false
-- pain_summary: short summary of the pain point
-- alternatives: are there known tools solving this?
-- solo_doable: true/false — can a solo dev build this?
-- monetizable: true/false — would users likely pay?
-- tags: a few keywords like 'macOS', 'productivity', 'calendar', etc.
-"""
+    prompt = _build_prompt(title, subreddit, url)
     try:
         # 使用新版OpenAI API格式
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = _get_openai_client().chat.completions.create(
+            model=GPT_MODEL,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.4
+            temperature=0.4,
+            response_format=IDEA_EVAL_FORMAT
         )
-        return response.choices[0].message.content.strip()
+        return json.loads(response.choices[0].message.content)
+    except Exception as e:
+        print(f"⚠️ GPT分析失败: {str(e)}")
+        return None
+
+async def analyze_post_with_gpt_async(client, title, subreddit, url, semaphore=None):
+    """analyze_post_with_gpt 的异步版本，配合 asyncio.gather 并发分析多个帖子"""
+    prompt = _build_prompt(title, subreddit, url)
+    semaphore = semaphore or asyncio.Semaphore(8)
+    try:
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=GPT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.4,
+                response_format=IDEA_EVAL_FORMAT
+            )
+        return json.loads(response.choices[0].message.content)
     except Exception as e:
         print(f"⚠️ GPT分析失败: {str(e)}")
         return None
 
+async def _analyze_posts(posts):
+    # 所有请求共用一个客户端，信号量限制同时在途的请求数以免触发限流
+    import openai
+    client = openai.AsyncOpenAI(api_key=_require_openai_key())
+    semaphore = asyncio.Semaphore(8)
+    tasks = [analyze_post_with_gpt_async(client, r['title'], r['subreddit'], r['url'], semaphore) for r in posts]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await client.close()
+
+# === Batch API（离线模式）===
+# 非交互场景下通过Batch API提交分析任务，成本约为同步调用的一半
+BATCH_STATE_FILE = ".gpt_batch_state.json"
+
+def submit_batch(posts):
+    """把待分析帖子写成JSONL提交到Batch API，并保存状态供下次运行取回结果"""
+    lines = []
+    for r in posts:
+        lines.append(json.dumps({
+            "custom_id": r["id"],
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": GPT_MODEL,
+                "messages": [{"role": "user", "content": _build_prompt(r['title'], r['subreddit'], r['url'])}],
+                "temperature": 0.4,
+                "response_format": IDEA_EVAL_FORMAT
+            }
+        }, ensure_ascii=False))
+    payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    client = _get_openai_client()
+    batch_file = client.files.create(file=("idea_batch.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+
+    # datetime不能直接序列化，状态文件里只保留报告需要的字段
+    saved_posts = [{k: v for k, v in r.items() if k != "created"} for r in posts]
+    with open(BATCH_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump({"batch_id": batch.id, "posts": saved_posts}, f, ensure_ascii=False)
+
+    print(f"📦 已提交Batch任务: {batch.id}，完成后重新运行 --batch 获取结果")
+    return batch.id
+
+# 不会再变为completed的终止状态，遇到时丢弃状态文件以便重新提交
+BATCH_FAILED_STATUSES = ("failed", "expired", "cancelled")
+
+def collect_batch():
+    """取回已完成的Batch结果；任务未完成或已失败时返回None"""
+    with open(BATCH_STATE_FILE, "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    client = _get_openai_client()
+    batch = client.batches.retrieve(state["batch_id"])
+    if batch.status in BATCH_FAILED_STATUSES:
+        print(f"❌ Batch任务 {batch.id} 状态为 {batch.status}，将重新提交")
+        os.remove(BATCH_STATE_FILE)
+        return None
+    if batch.status != "completed":
+        print(f"⏳ Batch任务 {batch.id} 当前状态: {batch.status}")
+        return None
+
+    analyses = {}
+    # 所有请求都出错时output_file_id为None，只有error_file_id
+    if batch.output_file_id:
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                content = item["response"]["body"]["choices"][0]["message"]["content"]
+                analyses[item["custom_id"]] = json.loads(content)
+            except (KeyError, IndexError, TypeError, ValueError):
+                print(f"⚠️ GPT分析失败: {item.get('custom_id')}")
+    if batch.error_file_id:
+        errors = client.files.content(batch.error_file_id).text
+        for line in errors.splitlines():
+            if line.strip():
+                print(f"⚠️ GPT分析失败: {json.loads(line).get('custom_id')}")
+
+    posts = state["posts"]
+    for r in posts:
+        r["gpt_analysis"] = analyses.get(r["id"])
+
+    os.remove(BATCH_STATE_FILE)
+    return posts
+
 def save_to_markdown(ideas, filename=None, competitor_data=None):
     # 新增价值评估维度说明
     VALUE_MATRIX_DESC = """
@@ -86,98 +249,161 @@ def save_to_markdown(ideas, filename=None, competitor_data=None):
         today = datetime.today().strftime("%Y-%m-%d")
         filename = f"top_ideas_{today}.md"
 
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write("# 📌 Top Reddit App/Extension Ideas for Solo Dev\n\n")
-        for idx, idea in enumerate(ideas, 1):
-            f.write(f"{idx}. [{idea['title']}]({idea['url']})  👍 {idea['score']} points\n")
-            f.write(f"    Subreddit: r/{idea['subreddit']} | Posted on: {idea['created_str']}\n\n")
-            if idea.get("gpt_analysis"):
-                f.write("**GPT Analysis**\n")
-                f.write(f"```json\n{idea['gpt_analysis']}\n```\n")
-                f.write(f"**商业评估**: {idea.get('value_insight', '待分析')}\n\n")
-            else:
-                f.write("_❌ GPT analysis failed_\n\n")
+    parts = ["# 📌 Top Reddit App/Extension Ideas for Solo Dev\n\n"]
+    for idx, idea in enumerate(ideas, 1):
+        analysis = idea.get("gpt_analysis")
+        parts.append(
+            f"{idx}. [{idea['title']}]({idea['url']})  👍 {idea['score']} points\n"
+            f"    Subreddit: r/{idea['subreddit']} | Posted on: {idea['created_str']}\n\n"
+        )
+        if analysis:
+            parts.append(
+                "**GPT Analysis**\n"
+                f"```json\n{json.dumps(analysis, ensure_ascii=False, indent=2)}\n```\n"
+                f"**商业评估**: {idea.get('value_insight', '待分析')}\n\n"
+            )
+        else:
+            parts.append("_❌ GPT analysis failed_\n\n")
 
-    print(f"✅ Results saved to: {filename}")
-    
     # 添加竞品对比附录
     if competitor_data:
-        with open(filename, "a", encoding="utf-8") as f:
-            f.write("\n## 🔍 竞品流量对比\n")
-            for domain, stats in competitor_data.items():
-                f.write(f"### {domain}\n")
-                if stats is not None:
-                    f.write(f"- 全球排名: {stats.get('global_rank', 'N/A')}\n")
-                    f.write(f"- 平均访问时长: {stats.get('avg_visit_duration', 0):.1f}分钟\n")
-                    f.write(f"- 页面/访问: {stats.get('pages_per_visit', 0):.1f}\n\n")
-                else:
-                    f.write("- 数据获取失败，请检查API密钥或网络连接\n\n")
-
-def search_ideas():
-    # 导入依赖模块
+        parts.append("\n## 🔍 竞品流量对比\n")
+        for domain, stats in competitor_data.items():
+            if stats is not None:
+                parts.append(
+                    f"### {domain}\n"
+                    f"- 全球排名: {stats.get('global_rank', 'N/A')}\n"
+                    f"- 平均访问时长: {stats.get('avg_visit_duration', 0):.1f}分钟\n"
+                    f"- 页面/访问: {stats.get('pages_per_visit', 0):.1f}\n\n"
+                )
+            else:
+                parts.append(f"### {domain}\n- 数据获取失败，请检查API密钥或网络连接\n\n")
+
+    # 整份报告一次写入
+    with open(filename, "w", encoding="utf-8") as f:
+        f.writelines(parts)
+
+    print(f"✅ Results saved to: {filename}")
+
+_WORD = re.compile(r'\S+')
+
+def _has_min_words(title, n=5):
+    # 数到n个词即停止，不像split()那样为每个词分配字符串
+    return sum(1 for _ in islice(_WORD.finditer(title), n)) == n
+
+# 这些subreddit的帖子在排序时额外加权30%
+_BOOSTED_SUBREDDITS = {"macapps", "chrome_extensions"}
+
+def _top_by_weighted_score(posts, k):
+    """一次向量化计算所有帖子的新鲜度加权分数，返回分数最高的k个（降序）"""
     import numpy as np
+
+    n = len(posts)
+    if n == 0:
+        return []
+    score_arr = np.fromiter((r["score"] for r in posts), dtype=np.float64, count=n)
+    age_arr = np.fromiter((r["age_days"] for r in posts), dtype=np.float64, count=n)
+    boosted = np.fromiter((r["subreddit"] in _BOOSTED_SUBREDDITS for r in posts), dtype=bool, count=n)
+
+    # 增强版算法：指数衰减(45天衰减周期)+对数转换防刷赞
+    scores = 0.8 * np.log1p(score_arr) * np.exp(-age_arr / 45.0) * np.where(boosted, 1.3, 1.0)
+
+    idx = np.argpartition(-scores, k - 1)[:k] if n > k else np.arange(n)
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [posts[i] for i in idx]
+
+def _thread_reddit():
+    """当前线程专用的Reddit实例，首次调用时创建"""
+    reddit = getattr(_THREAD_LOCAL, "reddit", None)
+    if reddit is None:
+        reddit = _THREAD_LOCAL.reddit = _new_reddit()
+    return reddit
+
+def _search_subreddit(sub, keyword):
+    print(f"🔍 Searching '{keyword}' in r/{sub}...")
+    try:
+        return list(_thread_reddit().subreddit(sub).search(keyword, sort="top", time_filter="month", limit=20))
+    except Exception as e:
+        print(f"❌ Search '{keyword}' in r/{sub} failed: {e}")
+        return []
+
+def finish_report(top):
     from competitive_analysis import CompetitorAnalyzer
     from business_value import ValueAssessor
-    
-    results = []
-
-    for sub in SUBREDDITS:
-        subreddit = reddit.subreddit(sub)
-        for keyword in KEYWORDS:
-            print(f"🔍 Searching '{keyword}' in r/{sub}...")
-            for post in subreddit.search(keyword, sort="top", time_filter="month", limit=20):
-                if not post.stickied and len(post.title) < 200:
-                    result = {
-                        "subreddit": sub,
-                        "title": post.title,
-                        "score": post.score,
-                        "url": post.url,
-                        "created": datetime.fromtimestamp(post.created_utc),
-                        "created_str": datetime.fromtimestamp(post.created_utc).strftime("%Y-%m-%d")
-                    }
-                    results.append(result)
-
-    # Deduplicate
-    seen = set()
-    deduped = []
-    for r in results:
-        if r["title"] not in seen:
-            seen.add(r["title"])
-            deduped.append(r)
-
-    # Sort with freshness weight
-    def weighted_score(r):
-        age_days = (datetime.utcnow() - r["created"]).days
-        # 增强版算法：指数衰减+对数转换
-        time_decay = np.exp(-age_days/45)  # 45天衰减周期
-        engagement_weight = np.log1p(r["score"]) * 0.8  # 对数转换防刷赞
-        return engagement_weight * time_decay * \
-               (1 + 0.3*(r["subreddit"] in {"macapps", "chrome_extensions"}))
-
-    # 新增数据清洗
-    filtered = [r for r in deduped 
-               if r["score"] >= 15  # 最低点赞阈值
-               and (datetime.utcnow() - r["created"]).days <= 90  # 三个月内
-               and len(r["title"].split()) >= 5]  # 排除简单提问
-
-    top = sorted(filtered, key=weighted_score, reverse=True)[:10]
-
-    for r in top:
-        print(f"\n🧠 GPT analyzing: {r['title']}")
-        analysis = analyze_post_with_gpt(r['title'], r['subreddit'], r['url'])
-        r['gpt_analysis'] = analysis
 
     # 新增商业价值评估
     assessor = ValueAssessor()
     top = assessor.enrich_with_value_analysis(top)
 
     # 生成竞品对比报告
-    competitor_report = {
-        'similarweb': CompetitorAnalyzer('similarweb.com').get_traffic_stats(),
-        'explodingtopics': CompetitorAnalyzer('explodingtopics.com').get_traffic_stats()
-    }
+    competitor_domains = {'similarweb': 'similarweb.com', 'explodingtopics': 'explodingtopics.com'}
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        stats = ex.map(lambda d: CompetitorAnalyzer(d).get_traffic_stats(), competitor_domains.values())
+        competitor_report = dict(zip(competitor_domains, stats))
 
     save_to_markdown(top, competitor_data=competitor_report)
 
+def search_ideas(batch=False):
+    # Batch模式下若已有提交的任务，先尝试取回结果
+    if batch and os.path.exists(BATCH_STATE_FILE):
+        top = collect_batch()
+        if top is not None:
+            finish_report(top)
+            return
+        # 任务仍在进行中时等待下次运行；任务已失败时状态文件已删除，重新抓取并提交
+        if os.path.exists(BATCH_STATE_FILE):
+            return
+    
+    # 先在主线程验证一次登录，失败时直接退出
+    _init_reddit()
+
+    # 以标题为键在收集时去重；当前时间只取一次，age_days在收集时预先算好
+    results = {}
+    now = datetime.utcnow()
+
+    # PRAW是同步I/O，用线程池让 (subreddit, keyword) 的搜索请求并发进行
+    # 结果按提交顺序读取，重复标题始终归属于 SUBREDDITS × KEYWORDS 顺序中最先出现的组合
+    jobs = [(sub, kw) for sub in SUBREDDITS for kw in KEYWORDS]
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        for (sub, _), posts in zip(jobs, ex.map(lambda job: _search_subreddit(*job), jobs)):
+            for post in posts:
+                # 廉价的数值过滤放在插入前：最低点赞阈值、排除置顶/超长标题/简单提问
+                if (post.title in results or post.stickied or len(post.title) >= 200
+                        or post.score < 15 or not _has_min_words(post.title)):
+                    continue
+                # 与 utcnow() 保持同一时区，age_days 才不会偏移本地时差
+                created_dt = datetime.utcfromtimestamp(post.created_utc)
+                age_days = (now - created_dt).days
+                if age_days > 90:  # 三个月内
+                    continue
+                results[post.title] = {
+                    "id": post.id,
+                    "subreddit": sub,
+                    "title": post.title,
+                    "score": post.score,
+                    "url": post.url,
+                    "created": created_dt,
+                    "created_str": created_dt.strftime("%Y-%m-%d"),
+                    "age_days": age_days
+                }
+
+    filtered = list(results.values())
+
+    top = _top_by_weighted_score(filtered, 10)
+
+    if batch:
+        submit_batch(top)
+        return
+
+    print(f"\n🧠 GPT analyzing {len(top)} posts concurrently...")
+    analyses = asyncio.run(_analyze_posts(top))
+    for r, analysis in zip(top, analyses):
+        r['gpt_analysis'] = None if isinstance(analysis, BaseException) else analysis
+
+    finish_report(top)
+
 if __name__ == "__main__":
-    search_ideas()
+    parser = argparse.ArgumentParser(description="Reddit idea radar")
+    parser.add_argument("--batch", action="store_true", help="使用Batch API离线分析（提交任务后退出，下次运行取回结果）")
+    args = parser.parse_args()
+    search_ideas(batch=args.batch)
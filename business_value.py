@@ -1,10 +1,16 @@
+import re
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+# 从文本形式的GPT分析结果中一次性提取布尔字段
+_FLAG_PAT = re.compile(r'"(monetizable|solo_doable|unmet_need)"\s*:\s*(true|false)', re.I)
+
+def _analysis_flags(analysis):
+    """把GPT分析结果统一成 {字段: bool}；兼容结构化dict和旧版JSON文本"""
+    if isinstance(analysis, dict):
+        return analysis
+    return {key.lower(): value.lower() == 'true' for key, value in _FLAG_PAT.findall(analysis)}
 
 class ValueAssessor:
-    def __init__(self):
-        self.scaler = MinMaxScaler()
-        
     def tech_feasibility(self, dev_skills, api_dependencies, complexity):
         """
         技术可行性评估
@@ -41,28 +47,36 @@ class ValueAssessor:
 
     def build_matrix(self, features_dict):
         """
-        生成三维评估矩阵
+        生成三维评估向量 (技术, 市场, 收益)
         features_dict: 包含所有评估参数的字典
         """
         tech = self.tech_feasibility(**features_dict['tech'])
         market = self.market_saturation(**features_dict['market'])
         revenue = self.monetization_potential(**features_dict['revenue'])
         
-        matrix = np.zeros((3,3))
-        matrix[0] = [tech, 0, 0]  # 技术维度
-        matrix[1] = [0, market, 0]  # 市场维度
-        matrix[2] = [0, 0, revenue]  # 收益维度
+        return np.array([tech, market, revenue])
+
+    def build_matrices(self, features_list):
+        """
+        为多个候选想法生成 (N, 3) 评估矩阵，并在候选之间按列做min-max标准化
+        features_list: 每个元素与 build_matrix 的 features_dict 相同
+        """
+        matrix = np.stack([self.build_matrix(features) for features in features_list])
         
-        # 标准化处理
-        return self.scaler.fit_transform(matrix)
+        # 标准化处理（按列min-max，常数列除以1避免除零）
+        mn = matrix.min(axis=0)
+        mx = matrix.max(axis=0)
+        rng = np.where(mx - mn == 0, 1, mx - mn)
+        return (matrix - mn) / rng
 
     def interpret_results(self, matrix):
         """
         矩阵结果解读与商业建议生成
+        matrix: build_matrices 结果中的一行（已标准化的技术、市场、收益得分）
         """
-        tech_strength = matrix[0,0]
-        market_opportunity = 1 - matrix[1,1]
-        revenue_potential = matrix[2,2]
+        tech_strength = matrix[0]
+        market_opportunity = 1 - matrix[1]
+        revenue_potential = matrix[2]
         
         if tech_strength > 0.7 and market_opportunity > 0.6:
             return {"建议": "蓝海机会", "行动项": ["快速MVP开发", "申请技术专利"]}
@@ -76,15 +90,13 @@ class ValueAssessor:
         为想法列表添加商业价值评估
         """
         for idea in ideas_list:
-            # 简单模拟评估，实际应用中应该基于GPT分析结果进行更复杂的评估
-            if 'gpt_analysis' in idea and idea['gpt_analysis']:
-                # 提取关键词判断商业价值
-                analysis = idea['gpt_analysis'].lower()
-                
-                # 简单评估逻辑
-                if 'true' in analysis and ('monetizable' in analysis or 'solo_doable' in analysis):
+            analysis = idea.get('gpt_analysis')
+            if analysis:
+                # 按字段判断商业价值
+                flags = _analysis_flags(analysis)
+                if flags.get('monetizable') and flags.get('solo_doable'):
                     idea['value_insight'] = "⭐⭐⭐⭐ 高商业价值，建议优先开发"
-                elif 'false' in analysis and 'monetizable' in analysis:
+                elif not flags.get('monetizable'):
                     idea['value_insight'] = "⭐⭐ 变现难度大，可作为开源项目"
                 else:
                     idea['value_insight'] = "⭐⭐⭐ 中等商业价值，需进一步市场调研"
@@ -1,40 +1,72 @@
 import os
+import json
+import functools
 from datetime import datetime
 import requests
-import matplotlib.pyplot as plt
 
 SIMILARWEB_API_KEY = os.getenv('SIMILARWEB_API_KEY')
+SIMILARWEB_BASE_URL = 'https://api.similarweb.com/v1/website'
+
+# 流量数据按月更新，按 (domain, YYYY-MM) 缓存到磁盘，同月内重复运行不再请求接口
+CACHE_DIR = '.competitor_cache'
+
+# 共享Session，复用keep-alive的TCP/TLS连接
+_SESSION = requests.Session()
+
+@functools.lru_cache(maxsize=128)
+def _fetch_traffic(domain, month):
+    cache_file = os.path.join(CACHE_DIR, f'{domain}_{month}.json')
+    if os.path.exists(cache_file):
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    if not SIMILARWEB_API_KEY:
+        raise ValueError('未设置SIMILARWEB_API_KEY')
+
+    endpoint = f'{SIMILARWEB_BASE_URL}/{domain}/total-traffic-and-engagement/visits'
+    params = {
+        'api_key': SIMILARWEB_API_KEY,
+        'start_date': month,
+        'end_date': month,
+        'granularity': 'monthly',
+        'main_domain_only': 'false'
+    }
+    response = _SESSION.get(endpoint, params=params, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    # 配额耗尽等错误也可能返回200，没有流量字段的响应不写入缓存
+    if not isinstance(data, dict) or not ('visits' in data or 'global_rank' in data):
+        raise ValueError(f'SimilarWeb返回了无效数据: {str(data)[:200]}')
+    stats = {
+        'global_rank': data.get('global_rank', 'N/A'),
+        'category_rank': data.get('category_rank', 'N/A'),
+        'avg_visit_duration': data.get('visit_duration', 0),
+        'pages_per_visit': data.get('pages_per_visit', 0),
+        'bounce_rate': data.get('bounce_rate', 0)
+    }
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(stats, f)
+    return stats
 
 class CompetitorAnalyzer:
     def __init__(self, domain):
         self.domain = domain
-        self.base_url = 'https://api.similarweb.com/v1/website'
+        self.base_url = SIMILARWEB_BASE_URL
 
     def get_traffic_stats(self):
-        endpoint = f'{self.base_url}/{self.domain}/total-traffic-and-engagement/visits'
-        params = {
-            'api_key': SIMILARWEB_API_KEY,
-            'start_date': (datetime.now().replace(day=1)).strftime('%Y-%m'),
-            'end_date': datetime.now().strftime('%Y-%m'),
-            'granularity': 'monthly',
-            'main_domain_only': 'false'
-        }
-        
         try:
-            response = requests.get(endpoint, params=params)
-            data = response.json()
-            return {
-                'global_rank': data.get('global_rank', 'N/A'),
-                'category_rank': data.get('category_rank', 'N/A'),
-                'avg_visit_duration': data.get('visit_duration', 0),
-                'pages_per_visit': data.get('pages_per_visit', 0),
-                'bounce_rate': data.get('bounce_rate', 0)
-            }
+            # 返回副本，避免调用方修改lru_cache中缓存的字典
+            return dict(_fetch_traffic(self.domain, datetime.now().strftime('%Y-%m')))
         except Exception as e:
             print(f'竞品分析失败: {str(e)}')
             return None
 
     def plot_traffic_trend(self, metrics):
+        # 只有绘图时才需要matplotlib，避免导入本模块时的初始化开销
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 6))
         for metric, values in metrics.items():
             plt.plot(values, label=metric)
@@ -12,7 +12,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import json
+import mmap
 import os
+import re
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
@@ -26,6 +28,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 添加CSS样式：样式表只从磁盘读取一次；每次重跑仍需输出，否则 Streamlit 会移除未重新输出的元素
+@st.cache_resource
+def load_css() -> str:
+    with open(os.path.join(os.path.dirname(__file__), "static", "dashboard.css"), "r", encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(load_css(), unsafe_allow_html=True)
+
 # Application title
 st.title("📊 Market Demand Radar")
 st.markdown("*Discover unfulfilled digital product opportunities*")
@@ -41,6 +51,8 @@ date_options = [
     "All time"
 ]
 selected_date_range = st.sidebar.selectbox("Date Range", date_options)
+# 时间范围标签对应的天数，"All time" 不过滤
+DATE_RANGE_DAYS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90}
 
 # Demand score filter
 min_demand = st.sidebar.slider("Minimum Demand Score", 0, 100, 50)
@@ -56,6 +68,59 @@ selected_sources = st.sidebar.multiselect("Data Sources", sources, default=sourc
 # Only show golden zone
 show_gold_only = st.sidebar.checkbox("Only Show Golden Zone", value=True)
 
+# 报告解析规则
+# 章节标题：行首 "### "
+SECTION_PATTERN = re.compile(rb"^### (?P<title>.+)$", re.M)
+# 字段行：兼容 "**字段**: 值"、"字段: 值" 与表格 "| 字段 | 值 |" 三种写法
+FIELD_PATTERN = re.compile(
+    r"(?P<key>需求分数|供应分数|机会分数|黄金区域|标签|来源|发布日期|痛点摘要)\**\s*[:：|]\s*(?P<value>[^|\n]*)"
+)
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+SCORE_FIELDS = {"需求分数": "demand_score", "供应分数": "supply_score", "机会分数": "opportunity_score"}
+
+def parse_section(title: str, body: str) -> Dict[str, Any]:
+    """从单个报告章节中提取字段，只写入实际找到的字段"""
+    post = {"title": title}
+    for m in FIELD_PATTERN.finditer(body):
+        key, value = m.group("key"), m.group("value").strip()
+        if key in SCORE_FIELDS:
+            number = NUMBER_PATTERN.match(value)
+            if number and SCORE_FIELDS[key] not in post:
+                post[SCORE_FIELDS[key]] = float(number.group())
+        elif key == "黄金区域":
+            post.setdefault("gold_zone", "✅" in value)
+        elif key == "标签":
+            tags = [tag.strip().strip("#").strip() for tag in value.split(",") if tag.strip()]
+            if tags:
+                post.setdefault("tags", tags)
+        elif key == "来源":
+            post.setdefault("source", value[2:] if value.startswith("r/") else value)
+        elif key == "发布日期":
+            post.setdefault("created_at", value)
+        elif key == "痛点摘要":
+            post.setdefault("pain_summary", value)
+    return post
+
+# 报告中缺失字段的默认值（机会分数由需求分数与供应分数推导，标签为列表需单独处理）
+REPORT_DEFAULTS = {
+    "demand_score": 50.0,
+    "supply_score": 30.0,
+    "gold_zone": False,
+    "source": "未知来源",
+    "pain_summary": "无摘要信息",
+}
+
+def fill_report_defaults(df: pd.DataFrame) -> pd.DataFrame:
+    """解析完成后一次性补齐缺失字段，而不是在解析循环里逐个判断"""
+    df = df.reindex(columns=df.columns.union(
+        [*REPORT_DEFAULTS, "opportunity_score", "tags", "created_at"], sort=False
+    ))
+    df = df.fillna({**REPORT_DEFAULTS, "created_at": datetime.now().strftime("%Y-%m-%d")})
+    df["opportunity_score"] = df["opportunity_score"].fillna(df["demand_score"] - df["supply_score"])
+    # fillna 不接受列表作为填充值
+    df["tags"] = df["tags"].map(lambda tags: tags if isinstance(tags, list) else ["未分类"])
+    return df
+
 # 加载数据函数
 def load_data():
     # 在实际应用中，这里应该从数据库加载数据
@@ -63,138 +128,70 @@ def load_data():
     
     # 检查是否有最新报告
     reports_dir = os.path.join(os.path.dirname(__file__), "reports")
-    report_files = [f for f in os.listdir(reports_dir) if f.startswith("market_report_") and f.endswith(".md")]
+    # 单次扫描目录取修改时间最新的报告，DirEntry 会缓存 stat 结果
+    with os.scandir(reports_dir) as entries:
+        latest = max(
+            (e for e in entries if e.name.startswith("market_report_") and e.name.endswith(".md")),
+            key=lambda e: e.stat().st_mtime,
+            default=None,
+        )
     
-    if not report_files:
+    if latest is None:
         # 如果没有报告文件，使用示例数据
         return generate_sample_data()
     
-    # 使用最新的报告文件
-    latest_report = sorted(report_files)[-1]
-    report_path = os.path.join(reports_dir, latest_report)
-    
+    # 以修改时间作为缓存键的一部分，文件更新后才重新解析
+    return _parse_report(latest.path, latest.stat().st_mtime)
+
+@st.cache_data(show_spinner=False)
+def _parse_report(report_path: str, mtime: float) -> pd.DataFrame:
+    """解析报告文件；Streamlit每次交互重跑脚本时，同一版本的文件只解析一次"""
     # 解析报告文件提取数据
-    # 这里简化处理，实际应用中应该使用更健壮的解析方法
     posts = []
     
     try:
-        with open(report_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            
-            # 简单解析，实际应用中应该使用更健壮的方法
-            sections = content.split("### ")[1:]
+        if os.path.getsize(report_path) == 0:
+            st.warning("无法从报告中提取数据，使用示例数据代替")
+            return generate_sample_data()
+        
+        # 内存映射报告文件，按字节偏移切分章节，只解码单个章节而不是复制整份文本
+        with open(report_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
             
-            for section in sections:
-                if not section.strip():
-                    continue
-                    
-                lines = section.split("\n")
-                if not lines:  # 空section检查
-                    continue
-                    
-                title = lines[0].strip()
-                
-                post = {"title": title}
-                
-                for line in lines[1:]:
-                    try:
-                        if "需求分数" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                value_part = parts[1].strip()
-                                # 提取数值，处理可能的格式问题
-                                if value_part and value_part[0].isdigit():
-                                    post["demand_score"] = float(value_part)
-                                else:
-                                    post["demand_score"] = 50.0  # 默认值
-                        elif "供应分数" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                value_part = parts[1].strip()
-                                if value_part and value_part[0].isdigit():
-                                    post["supply_score"] = float(value_part)
-                                else:
-                                    post["supply_score"] = 30.0  # 默认值
-                        elif "机会分数" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                value_part = parts[1].strip()
-                                if value_part and value_part[0].isdigit():
-                                    post["opportunity_score"] = float(value_part)
-                                else:
-                                    # 如果没有机会分数，计算一个
-                                    if "demand_score" in post and "supply_score" in post:
-                                        post["opportunity_score"] = post["demand_score"] - post["supply_score"]
-                                    else:
-                                        post["opportunity_score"] = 50.0  # 默认值
-                        elif "黄金区域" in line:
-                            post["gold_zone"] = "✅" in line
-                        elif "标签" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                tags_text = parts[1].strip()
-                                if tags_text:
-                                    post["tags"] = [tag.strip("#").strip() for tag in tags_text.split(",")]
-                                else:
-                                    post["tags"] = ["未分类"]  # 默认标签
-                            else:
-                                post["tags"] = ["未分类"]
-                        elif "来源" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                source_text = parts[1].split("|")[0].strip() if "|" in parts[1] else parts[1].strip()
-                                post["source"] = source_text.strip("r/")
-                            else:
-                                post["source"] = "未知来源"
-                        elif "发布日期" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                post["created_at"] = parts[1].strip()
-                            else:
-                                post["created_at"] = datetime.now().strftime("%Y-%m-%d")
-                        elif "痛点摘要" in line and ":" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                post["pain_summary"] = parts[1].strip()
-                            else:
-                                post["pain_summary"] = "无摘要信息"
-                    except Exception as parsing_error:
-                        st.warning(f"解析行时出错: {line} - {str(parsing_error)}")
-                        continue
-                
-                # 确保所有必要字段都存在
-                required_fields = ["demand_score", "supply_score", "opportunity_score", "gold_zone", "tags", "source", "created_at", "pain_summary"]
-                for field in required_fields:
-                    if field not in post:
-                        if field == "demand_score":
-                            post[field] = 50.0
-                        elif field == "supply_score":
-                            post[field] = 30.0
-                        elif field == "opportunity_score":
-                            post[field] = post.get("demand_score", 50.0) - post.get("supply_score", 30.0)
-                        elif field == "gold_zone":
-                            post[field] = False
-                        elif field == "tags":
-                            post[field] = ["未分类"]
-                        elif field == "source":
-                            post[field] = "未知来源"
-                        elif field == "created_at":
-                            post[field] = datetime.now().strftime("%Y-%m-%d")
-                        elif field == "pain_summary":
-                            post[field] = "无摘要信息"
-                
+            # 按行首的 "### " 切分章节（不会误切 "#### " 小标题），每个章节用一个正则提取所有字段
+            headers = list(SECTION_PATTERN.finditer(content))
+            for i, header in enumerate(headers):
+                end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+                post = parse_section(
+                    header.group("title").decode("utf-8").strip(),
+                    content[header.end():end].decode("utf-8")
+                )
                 posts.append(post)
         
         if not posts:
             st.warning("无法从报告中提取数据，使用示例数据代替")
             return generate_sample_data()
             
-        return pd.DataFrame(posts)
+        return finalize_dtypes(fill_report_defaults(pd.DataFrame(posts)))
     except Exception as e:
         st.error(f"加载报告数据时出错: {str(e)}")
         return generate_sample_data()
 
-# 生成示例数据
+# 统一列类型：分数0-100用float32足够，黄金区域为bool，数据源为category；并按机会分数降序排列
+def finalize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    # 日期只在加载时解析一次，过滤时直接比较 datetime64
+    df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
+    df = df.astype({
+        "demand_score": "float32",
+        "supply_score": "float32",
+        "opportunity_score": "float32",
+        "gold_zone": "bool",
+        "source": "category",
+    })
+    # 加载时按机会分数排好序，过滤只保留行的相对顺序，下游无需再排序
+    return df.sort_values("opportunity_score", ascending=False, ignore_index=True)
+
+# 生成示例数据（日期相对当前时间生成，缓存一小时）
+@st.cache_data(show_spinner=False, ttl=3600)
 def generate_sample_data():
     # 创建示例数据
     data = {
@@ -252,44 +249,66 @@ def generate_sample_data():
     }
     
     # 计算机会分数和黄金区域
-    opportunity_scores = [d - s for d, s in zip(data["demand_score"], data["supply_score"])]
-    gold_zones = [(d >= 50 and s <= 30 and o >= 70) for d, s, o in zip(data["demand_score"], data["supply_score"], opportunity_scores)]
+    demand = np.asarray(data["demand_score"], dtype=np.float32)
+    supply = np.asarray(data["supply_score"], dtype=np.float32)
+    opportunity = demand - supply
     
-    data["opportunity_score"] = opportunity_scores
-    data["gold_zone"] = gold_zones
+    data["demand_score"] = demand
+    data["supply_score"] = supply
+    data["opportunity_score"] = opportunity
+    data["gold_zone"] = (demand >= 50) & (supply <= 30) & (opportunity >= 70)
     
-    return pd.DataFrame(data)
+    return finalize_dtypes(pd.DataFrame(data))
+
+# 标签指示矩阵：把每行的标签列表转成 (行数 × 标签数) 的稀疏 0/1 矩阵，过滤和计数都在矩阵上完成
+@st.cache_data(show_spinner=False)
+def build_tag_matrix(tags: pd.Series):
+    from scipy import sparse
+    from sklearn.preprocessing import MultiLabelBinarizer
+    
+    if tags.empty:
+        return sparse.csc_matrix((0, 0), dtype=np.uint8), np.array([], dtype=object), {}
+    
+    mlb = MultiLabelBinarizer(sparse_output=True)
+    tag_matrix = mlb.fit_transform(tags).astype(np.uint8).tocsc()  # 按列切片选标签
+    tag_index = {tag: i for i, tag in enumerate(mlb.classes_)}
+    return tag_matrix, mlb.classes_, tag_index
 
 # 加载数据
 df = load_data()
 
 # 应用过滤器
-def filter_data(df):
-    # 时间范围过滤
-    if selected_date_range != "全部时间":
-        days = 7 if "7" in selected_date_range else (30 if "30" in selected_date_range else 90)
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        df = df[df["created_at"] >= cutoff_date]
+@st.cache_data(show_spinner=False, ttl=3600)
+def filter_data(df, cutoff, min_demand, selected_tags, selected_sources, show_gold_only):
+    # 所有条件合并为一个布尔掩码，最后只切片一次
+    mask = df["demand_score"].values >= min_demand
     
-    # 需求分数过滤
-    df = df[df["demand_score"] >= min_demand]
+    # 时间范围过滤（cutoff为None表示不限时间）
+    if cutoff is not None:
+        mask &= df["created_at"].values >= cutoff.to_datetime64()
     
     # 标签过滤
     if selected_tags:
-        df = df[df["tags"].apply(lambda x: any(tag in x for tag in selected_tags))]
+        tag_matrix, _, tag_index = build_tag_matrix(df["tags"])
+        cols = [tag_index[tag] for tag in selected_tags if tag in tag_index]
+        mask &= np.asarray(tag_matrix[:, cols].sum(axis=1)).ravel() > 0
     
     # 数据源过滤
     if selected_sources:
-        df = df[df["source"].isin(selected_sources)]
+        mask &= df["source"].isin(selected_sources).values
     
     # 黄金区域过滤
     if show_gold_only:
-        df = df[df["gold_zone"] == True]
+        mask &= df["gold_zone"].to_numpy()
     
-    return df
+    return df[mask]
 
-# 应用过滤器
-filtered_df = filter_data(df)
+# 时间范围的起点在缓存函数外计算并取整到天，作为缓存键的一部分，避免缓存结果沿用过期的当前时间
+days = DATE_RANGE_DAYS.get(selected_date_range)
+cutoff = pd.Timestamp.now().normalize() - pd.Timedelta(days=days) if days is not None else None
+
+# 应用过滤器（缓存以DataFrame内容和过滤条件为键）
+filtered_df = filter_data(df, cutoff, min_demand, tuple(selected_tags), tuple(selected_sources), show_gold_only)
 
 # 显示统计信息
 st.header("📈 摘要统计")
@@ -302,7 +321,7 @@ with col1:
               help="数据集中的想法总数")
 
 with col2:
-    st.metric("黄金区域想法", len(df[df["gold_zone"] == True]), delta=None, 
+    st.metric("黄金区域想法", int(np.count_nonzero(df["gold_zone"].to_numpy())), delta=None, 
               delta_color="normal", 
               help="满足黄金区域条件的高价值想法数量")
 
@@ -332,63 +351,52 @@ fig.add_shape(type="rect", x0=0, y0=0, x1=30, y1=50,
 fig.add_shape(type="rect", x0=30, y0=0, x1=100, y1=50, 
              fillcolor="rgba(169, 169, 169, 0.15)", line=dict(width=0))
 
-# 添加黄金区域散点
-gold_df = filtered_df[filtered_df["gold_zone"] == True]
-if not gold_df.empty:
-    fig.add_trace(go.Scatter(
-        x=gold_df["supply_score"],
-        y=gold_df["demand_score"],
+# 添加想法散点：黄金区域与其他区域合并为一条轨迹，颜色和大小按点给出
+if not filtered_df.empty:
+    is_gold = filtered_df["gold_zone"].to_numpy()
+    opportunity = filtered_df["opportunity_score"].values
+    fig.add_trace(go.Scattergl(
+        x=filtered_df["supply_score"],
+        y=filtered_df["demand_score"],
         mode="markers+text",
         marker=dict(
-            size=gold_df["opportunity_score"] / 2 + 30,  # 根据机会分数动态调整大小
-            color="rgba(255, 215, 0, 0.8)",  # 金色，半透明
-            line=dict(width=2, color="#b8860b"),  # 深金色边框
+            size=np.where(is_gold, opportunity / 2 + 30, opportunity / 3 + 20),  # 根据机会分数动态调整大小
+            color=np.where(is_gold, "rgba(255, 215, 0, 0.8)", "rgba(65, 105, 225, 0.7)"),  # 金色 / 蓝色，半透明
+            line=dict(
+                width=np.where(is_gold, 2, 1),
+                color=np.where(is_gold, "#b8860b", "#000080")  # 深金色 / 深蓝色边框
+            ),
             symbol="circle",
             sizemode="diameter"
         ),
-        text=gold_df["title"],
+        text=filtered_df["title"],
         textposition="middle center",
-        textfont=dict(size=10, color="black"),
-        name="黄金区域",
+        textfont=dict(size=np.where(is_gold, 10, 9), color=np.where(is_gold, "black", "white")),
+        name="想法",
+        showlegend=False,
         hovertemplate=(
             "<b>%{text}</b><br><br>"
             "<b>需求分数:</b> %{y:.1f}<br>"
             "<b>供应分数:</b> %{x:.1f}<br>"
-            "<b>机会分数:</b> %{marker.size:.1f}<br><br>"
-            "<b>痛点摘要:</b><br>%{customdata}<br><br>"
+            "<b>机会分数:</b> %{customdata[0]:.1f}<br><br>"
+            "<b>痛点摘要:</b><br>%{customdata[1]}<br><br>"
             "<extra></extra>"
         ),
-        customdata=gold_df["pain_summary"]
-    ))
-
-# 添加其他区域散点
-other_df = filtered_df[filtered_df["gold_zone"] == False]
-if not other_df.empty:
-    fig.add_trace(go.Scatter(
-        x=other_df["supply_score"],
-        y=other_df["demand_score"],
-        mode="markers+text",
-        marker=dict(
-            size=other_df["opportunity_score"] / 3 + 20,  # 根据机会分数动态调整大小
-            color="rgba(65, 105, 225, 0.7)",  # 蓝色，半透明
-            line=dict(width=1, color="#000080"),  # 深蓝色边框
-            symbol="circle",
-            sizemode="diameter"
-        ),
-        text=other_df["title"],
-        textposition="middle center",
-        textfont=dict(size=9, color="white"),
-        name="其他区域",
-        hovertemplate=(
-            "<b>%{text}</b><br><br>"
-            "<b>需求分数:</b> %{y:.1f}<br>"
-            "<b>供应分数:</b> %{x:.1f}<br>"
-            "<b>机会分数:</b> %{marker.size:.1f}<br><br>"
-            "<b>痛点摘要:</b><br>%{customdata}<br><br>"
-            "<extra></extra>"
-        ),
-        customdata=other_df["pain_summary"]
+        customdata=np.stack([opportunity, filtered_df["pain_summary"].values], axis=-1)
     ))
+    
+    # 图例只用于说明颜色：两条不含数据的轨迹，分别使用黄金区域和其他区域的标记样式
+    for legend_name, fill_color, border_color in (
+        ("黄金区域", "rgba(255, 215, 0, 0.8)", "#b8860b"),
+        ("其他区域", "rgba(65, 105, 225, 0.7)", "#000080"),
+    ):
+        fig.add_trace(go.Scattergl(
+            x=[None],
+            y=[None],
+            mode="markers",
+            marker=dict(size=12, color=fill_color, line=dict(width=1, color=border_color), symbol="circle"),
+            name=legend_name
+        ))
 
 # 添加四象限分隔线
 fig.add_shape(type="line", x0=30, y0=0, x1=30, y1=100, line=dict(color="gray", width=1.5, dash="dash"))
@@ -459,27 +467,34 @@ st.plotly_chart(fig, use_container_width=True)
 st.header("🥇 黄金区域想法")
 
 # 筛选黄金区域想法
-gold_zone_df = filtered_df[filtered_df["gold_zone"] == True].sort_values("opportunity_score", ascending=False)
+gold_zone_df = filtered_df.iloc[np.flatnonzero(filtered_df["gold_zone"].to_numpy())]  # 已按机会分数降序
 
 if len(gold_zone_df) > 0:
-    for i, row in gold_zone_df.iterrows():
-        with st.expander(f"{row['title']} (机会分数: {row['opportunity_score']:.1f})"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"**痛点摘要**: {row['pain_summary']}")
-                st.markdown(f"**来源**: {row['source']}")
-                st.markdown(f"**发布日期**: {row['created_at']}")
-            
-            with col2:
-                st.markdown(f"**需求分数**: {row['demand_score']:.1f}")
-                st.markdown(f"**供应分数**: {row['supply_score']:.1f}")
-                st.markdown(f"**标签**: {', '.join(['#' + tag for tag in row['tags']])}")
-            
-            # 添加"开始构建"按钮
-            if st.button(f"🚀 开始构建", key=f"build_{i}"):
-                st.success("已记录您的兴趣！我们会提供更多资源帮助您开始构建。")
-                # 在实际应用中，这里应该记录用户点击并触发后续流程
+    # 整张表一次性渲染，避免每行多个 markdown 元素
+    display_df = gold_zone_df.assign(tags_fmt=gold_zone_df["tags"].str.join(", "))[
+        ["title", "opportunity_score", "demand_score", "supply_score", "source", "created_at", "tags_fmt", "pain_summary"]
+    ]
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "title": "标题",
+            "opportunity_score": st.column_config.ProgressColumn("机会分数", format="%.1f", min_value=0, max_value=100),
+            "demand_score": st.column_config.NumberColumn("需求分数", format="%.1f"),
+            "supply_score": st.column_config.NumberColumn("供应分数", format="%.1f"),
+            "source": "来源",
+            "created_at": st.column_config.DateColumn("发布日期", format="YYYY-MM-DD"),
+            "tags_fmt": "标签",
+            "pain_summary": "痛点摘要",
+        },
+    )
+    
+    # 添加"开始构建"按钮：一个选择框 + 一个按钮，而不是每行一个
+    selected_title = st.selectbox("选择想法", gold_zone_df["title"].tolist())
+    if st.button("🚀 开始构建", key="build_selected"):
+        st.success(f"已记录您对「{selected_title}」的兴趣！我们会提供更多资源帮助您开始构建。")
+        # 在实际应用中，这里应该记录用户点击并触发后续流程
 else:
     st.info("没有找到符合条件的黄金区域想法。请尝试调整过滤器。")
 
@@ -487,9 +502,10 @@ else:
 st.header("🏷️ 标签分布")
 
 # 提取所有标签并计数
-all_tags_list = [tag for tags_list in filtered_df["tags"] for tag in tags_list]
-tags_count = pd.Series(all_tags_list).value_counts().reset_index()
-tags_count.columns = ["tag", "count"]
+tag_matrix, tag_names, _ = build_tag_matrix(filtered_df["tags"])
+tag_totals = np.asarray(tag_matrix.sum(axis=0)).ravel()
+tag_order = np.argsort(-tag_totals, kind="stable")
+tags_count = pd.DataFrame({"tag": tag_names[tag_order], "count": tag_totals[tag_order]})
 
 # 创建条形图
 fig = px.bar(
@@ -507,9 +523,10 @@ st.plotly_chart(fig, use_container_width=True)
 # 数据源分布
 st.header("📊 数据源分布")
 
-# 计算数据源分布
+# 计算数据源分布（source为category类型，value_counts会包含计数为0的类别）
 source_count = filtered_df["source"].value_counts().reset_index()
 source_count.columns = ["source", "count"]
+source_count = source_count[source_count["count"] > 0]
 
 # 创建饼图
 fig = px.pie(
@@ -544,33 +561,31 @@ else:
             if tag not in top_tags and len(top_tags) < 5:
                 top_tags.append(tag)
 
-# 简化数据生成过程，使用字典先构建数据
-data_dict = {
-    "month": [],
-    "tag_name": [],
-    "post_count": []
-}
-
-# 为每个标签和月份填充数据
-for tag in top_tags:
-    for i, date_str in enumerate(date_strs):
-        # 生成随机趋势数据
-        if tag == 'productivity':
-            value = 10 + i*2 + np.random.randint(-2, 3)
-        elif tag == 'ai':
-            value = 5 + i*3 + np.random.randint(-1, 4)
-        elif tag == 'mobile':
-            value = 15 + np.random.randint(-2, 3)
-        else:
-            value = np.random.randint(5, 20)
-        
-        # 添加到字典
-        data_dict["month"].append(date_str)
-        data_dict["tag_name"].append(tag)
-        data_dict["post_count"].append(value)
+# 生成随机趋势数据：一次性按 (标签, 月份) 矩阵抽样，结果缓存避免每次交互重新抽样
+@st.cache_data(show_spinner=False)
+def generate_tag_trend(top_tags, date_strs):
+    rng = np.random.default_rng(0)
+    shape = (len(top_tags), len(date_strs))
+    tags = np.array(top_tags)[:, None]
+    steps = np.arange(len(date_strs))
+    
+    values = np.select(
+        [tags == "productivity", tags == "ai", tags == "mobile"],
+        [
+            10 + steps * 2 + rng.integers(-2, 3, size=shape),
+            5 + steps * 3 + rng.integers(-1, 4, size=shape),
+            15 + rng.integers(-2, 3, size=shape),
+        ],
+        default=rng.integers(5, 20, size=shape),
+    )
+    
+    return pd.DataFrame({
+        "month": np.tile(date_strs, len(top_tags)),
+        "tag_name": np.repeat(top_tags, len(date_strs)),
+        "post_count": values.ravel(),
+    })
 
-# 创建DataFrame
-trend_df = pd.DataFrame(data_dict)
+trend_df = generate_tag_trend(tuple(top_tags), tuple(date_strs))
 
 # 打印调试信息
 st.write("可用的列名:", trend_df.columns.tolist())
@@ -585,7 +600,8 @@ try:
         title="热门标签趋势 (过去90天)",
         markers=True,
         labels={"month": "月份", "post_count": "相关帖子数量", "tag_name": "标签"},
-        template="plotly_white"
+        template="plotly_white",
+        render_mode="webgl"
     )
     
     # 更新布局
@@ -623,48 +639,3 @@ st.markdown("""
 st.markdown("---")
 st.markdown("*Market Demand Radar V2 - 由PRD V2计划实现*")
 st.markdown(f"*最后更新: {datetime.now().strftime('%Y-%m-%d %H:%M')}*")
-
-# 添加CSS样式
-st.markdown("""
-<style>
-.main .block-container {
-    padding-top: 2rem;
-    padding-bottom: 2rem;
-}
-.stMetric {
-    background-color: #00ba8a;
-    color: white;
-    padding: 20px;
-    border-radius: 10px;
-    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    text-align: center;
-}
-.stMetric label {
-    color: white !important;
-    font-weight: bold !important;
-    font-size: 1.2rem !important;
-}
-.stMetric .data {
-    font-size: 2rem !important;
-    font-weight: bold !important;
-    color: white !important;
-}
-div[data-testid="stMetricValue"] > div {
-    font-size: 28px !important;
-    color: white !important;
-}
-div[data-testid="stMetricLabel"] {
-    font-size: 16px !important;
-    color: white !important;
-    font-weight: bold !important;
-}
-.stMetric:hover {
-    transform: translateY(-5px);
-    transition: transform 0.3s ease;
-    box-shadow: 0 6px 8px rgba(0, 0, 0, 0.15);
-}
-h1, h2, h3 {
-    color: #00ba8a;
-}
-</style>
-""", unsafe_allow_html=True)
\ No newline at end of file
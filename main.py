@@ -25,6 +25,7 @@ from src.extractor import LLMExtractor
 from src.scoring import ScoringEngine
 from src.competitive import CompetitiveFetcher
 from src.report import ReportBuilder
+from src.config import APPSTORE_IDS, APPSTORE_NAMES
 
 # Set up command line arguments
 def parse_args():
@@ -80,11 +81,11 @@ async def main():
     print("🔄 Fetching review data from App Store...")
     try:
         async with AppStoreScraper() as app_scraper:
-            # Configure the list of app IDs to scrape
-            app_ids = ["1232780281", "310633997", "1274495053"]  # Examples: Notion, Evernote, Things 3
-            for app_id in app_ids:
-                app_reviews = await app_scraper.fetch_app_reviews(app_id, limit=post_limit//len(app_ids))
-                print(f"  ✅ Retrieved {len(app_reviews)} reviews from App ID {app_id}")
+            # The list of apps to scrape comes from APPSTORE_APP_IDS in src/config.py
+            per_app_limit = max(1, post_limit // len(APPSTORE_IDS))
+            for app_id, app_name in zip(APPSTORE_IDS, APPSTORE_NAMES):
+                app_reviews = await app_scraper.fetch_app_reviews(app_id, limit=per_app_limit)
+                print(f"  ✅ Retrieved {len(app_reviews)} reviews from {app_name} ({app_id})")
                 raw_posts.extend(app_reviews)
     except Exception as e:
         print(f"  ❌ Error scraping App Store reviews: {str(e)}")
@@ -124,8 +125,8 @@ async def main():
     # 6. Add competitive data
     if not skip_competitive:
         print("🔍 Fetching competitive data...")
-        fetcher = CompetitiveFetcher()
-        enriched_posts = await fetcher.batch_enrich_posts(processed_posts)
+        async with CompetitiveFetcher() as fetcher:
+            enriched_posts = await fetcher.batch_enrich_posts(processed_posts)
         print(f"  ✅ Successfully added competitive data")
     else:
         print("⏩ Skipping competitive analysis")
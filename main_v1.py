@@ -16,12 +16,47 @@ import os
 import sys
 from datetime import datetime
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 # 导入项目模块
-from analysis import analyze_post_with_gpt, save_to_markdown, reddit, KEYWORDS, SUBREDDITS
+from analysis import analyze_post_with_gpt, save_to_markdown, _init_reddit, KEYWORDS, SUBREDDITS
 from business_value import ValueAssessor
 from scoring_engine import DemandSupplyScorer
 from competitive_analysis import CompetitorAnalyzer
+from src.keywords import build_keyword_matcher
+
+# 搜索单个subreddit的热门帖子，返回匹配关键词的想法
+def scan_subreddit(reddit, subreddit_name, post_limit, matches_keyword):
+    ideas = []
+    try:
+        subreddit = reddit.subreddit(subreddit_name)
+        print(f"📱 正在搜索 r/{subreddit_name}...")
+        
+        # 搜索热门帖子
+        for post in subreddit.hot(limit=post_limit):
+            title = post.title.lower()
+            
+            # 检查是否包含关键词
+            if matches_keyword(title):
+                created_date = datetime.fromtimestamp(post.created_utc)
+                created_str = created_date.strftime("%Y-%m-%d")
+                
+                idea = {
+                    "title": post.title,
+                    "url": f"https://www.reddit.com{post.permalink}",
+                    "subreddit": subreddit_name,
+                    "score": post.score,
+                    "created_date": created_date,
+                    "created_str": created_str
+                }
+                
+                ideas.append(idea)
+                print(f"✅ 找到想法: {post.title[:60]}... (👍 {post.score})")
+    
+    except Exception as e:
+        print(f"❌ 搜索 r/{subreddit_name} 时出错: {str(e)}")
+    
+    return ideas
 
 # 设置命令行参数
 def parse_args():
@@ -45,49 +80,36 @@ def main():
     skip_gpt = args.no_gpt
     
     print(f"🔍 开始搜索 {len(subreddits)} 个subreddit的 {len(keywords)} 个关键词...")
+    reddit = _init_reddit()
+    
+    matches_keyword = build_keyword_matcher(keywords)
     
     # 收集想法
     ideas = []
     
-    for subreddit_name in subreddits:
-        try:
-            subreddit = reddit.subreddit(subreddit_name)
-            print(f"📱 正在搜索 r/{subreddit_name}...")
-            
-            # 搜索热门帖子
-            for post in subreddit.hot(limit=post_limit):
-                title = post.title.lower()
-                
-                # 检查是否包含关键词
-                if any(keyword.lower() in title for keyword in keywords):
-                    created_date = datetime.fromtimestamp(post.created_utc)
-                    created_str = created_date.strftime("%Y-%m-%d")
-                    
-                    idea = {
-                        "title": post.title,
-                        "url": f"https://www.reddit.com{post.permalink}",
-                        "subreddit": subreddit_name,
-                        "score": post.score,
-                        "created_date": created_date,
-                        "created_str": created_str
-                    }
-                    
-                    # GPT分析
-                    if not skip_gpt:
-                        print(f"🧠 GPT分析: {post.title[:40]}...")
-                        gpt_result = analyze_post_with_gpt(post.title, subreddit_name, idea["url"])
-                        idea["gpt_analysis"] = gpt_result
-                    
-                    ideas.append(idea)
-                    print(f"✅ 找到想法: {post.title[:60]}... (👍 {post.score})")
-        
-        except Exception as e:
-            print(f"❌ 搜索 r/{subreddit_name} 时出错: {str(e)}")
+    # 各subreddit的抓取互不依赖，并发发起请求；按subreddit原顺序合并结果
+    with ThreadPoolExecutor(max_workers=min(8, len(subreddits)) or 1) as executor:
+        for found in executor.map(
+            lambda name: scan_subreddit(reddit, name, post_limit, matches_keyword),
+            subreddits
+        ):
+            ideas.extend(found)
     
     if not ideas:
         print("❌ 未找到符合条件的想法，请尝试其他关键词或subreddit")
         return
     
+    # GPT分析：先收集完所有帖子，再并发请求，避免逐条串行等待
+    if not skip_gpt:
+        print(f"🧠 GPT分析 {len(ideas)} 个想法...")
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = executor.map(
+                lambda idea: analyze_post_with_gpt(idea["title"], idea["subreddit"], idea["url"]),
+                ideas
+            )
+            for idea, gpt_result in zip(ideas, results):
+                idea["gpt_analysis"] = gpt_result
+    
     print(f"📊 找到 {len(ideas)} 个想法，开始评估...")
     
     # 商业价值评估
@@ -18,7 +18,9 @@ import sys
 import asyncio
 import argparse
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Awaitable, Callable
+
+import httpx
 
 # 导入项目模块
 from src.scrapers.reddit_scraper import RedditScraper, DEFAULT_SUBREDDITS
@@ -29,6 +31,129 @@ from src.extractor import LLMExtractor
 from src.scoring import ScoringEngine
 from src.competitive import CompetitiveFetcher
 from src.report import ReportBuilder
+from src.config import APPSTORE_IDS, APPSTORE_NAMES
+
+# 抓取并发上限与共享连接池配置
+MAX_CONCURRENT_REQUESTS = 64
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# 流水线各阶段的worker数量（LLM请求数另由提取器内部的信号量限制）
+EXTRACT_WORKERS = 16
+ENRICH_WORKERS = 16
+
+async def run_stage(in_q: asyncio.Queue, out_q: asyncio.Queue,
+                    handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                    workers: int, downstream_workers: int) -> None:
+    """
+    流水线阶段：多个worker从输入队列取帖子处理后放入输出队列
+    收到None表示上游结束；本阶段全部结束后向下游发送downstream_workers个None
+    """
+    async def worker():
+        while True:
+            post = await in_q.get()
+            if post is None:
+                break
+            await out_q.put(await handler(post))
+    
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    for _ in range(downstream_workers):
+        await out_q.put(None)
+
+async def passthrough(post: Dict[str, Any]) -> Dict[str, Any]:
+    """跳过某一阶段时原样传递帖子"""
+    return post
+
+async def scrape_all(client: httpx.AsyncClient, subreddits: List[str], post_limit: int,
+                     raw_q: asyncio.Queue, downstream_workers: int) -> int:
+    """
+    并发抓取所有数据源，每抓到一批帖子立即放入队列，供下游阶段开始处理
+    
+    Returns:
+        抓取到的原始帖子总数
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    total = 0
+    
+    async def emit(posts: List[Dict[str, Any]]):
+        nonlocal total
+        total += len(posts)
+        for post in posts:
+            await raw_q.put(post)
+    
+    # 1. Fetch data from Reddit
+    async def scrape_reddit():
+        print("🔄 Fetching data from Reddit...")
+        async with RedditScraper(client=client) as reddit_scraper:
+            async def fetch(subreddit_name):
+                try:
+                    async with semaphore:
+                        posts = await reddit_scraper.fetch_subreddit_posts(subreddit_name, limit=post_limit)
+                except Exception as e:
+                    print(f"  ❌ Error scraping r/{subreddit_name}: {str(e)}")
+                    return
+                print(f"  ✅ Retrieved {len(posts)} posts from r/{subreddit_name}")
+                await emit(posts)
+            await asyncio.gather(*(fetch(subreddit_name) for subreddit_name in subreddits))
+    
+    # 2. Fetch data from Product Hunt
+    async def scrape_producthunt():
+        print("🔄 Fetching data from Product Hunt...")
+        try:
+            async with ProductHuntScraper(client=client) as ph_scraper:
+                ph_posts = await ph_scraper.fetch_asks(limit=post_limit)
+                print(f"  ✅ Retrieved {len(ph_posts)} posts from Product Hunt")
+                await emit(ph_posts)
+        except Exception as e:
+            print(f"  ❌ Error scraping Product Hunt: {str(e)}")
+    
+    # 3. Fetch review data from App Store
+    async def scrape_appstore():
+        print("🔄 Fetching review data from App Store...")
+        async with AppStoreScraper(client=client) as app_scraper:
+            # The list of apps to scrape comes from APPSTORE_APP_IDS in src/config.py
+            per_app_limit = max(1, post_limit // len(APPSTORE_IDS))
+            async def fetch(app_id, app_name):
+                try:
+                    async with semaphore:
+                        app_reviews = await app_scraper.fetch_app_reviews(app_id, limit=per_app_limit)
+                except Exception as e:
+                    print(f"  ❌ Error scraping App Store reviews for {app_name} ({app_id}): {str(e)}")
+                    return
+                print(f"  ✅ Retrieved {len(app_reviews)} reviews from {app_name} ({app_id})")
+                await emit(app_reviews)
+            await asyncio.gather(*(fetch(app_id, app_name) for app_id, app_name in zip(APPSTORE_IDS, APPSTORE_NAMES)))
+    
+    # 4. Fetch data from Chrome Web Store
+    async def scrape_chromestore():
+        print("🔄 Fetching data from Chrome Web Store...")
+        try:
+            async with ChromeStoreScraper(client=client) as chrome_scraper:
+                # Get popular extensions
+                extensions = await chrome_scraper.fetch_top_extensions(limit=10)
+                print(f"  ✅ Retrieved {len(extensions)} popular extensions")
+                
+                # Get extension reviews (only the top 5 extensions)
+                async def fetch(extension):
+                    try:
+                        async with semaphore:
+                            extension_post = await chrome_scraper.fetch_and_convert_to_raw_post(extension["id"])
+                    except Exception as e:
+                        print(f"  ❌ Error scraping Chrome Web Store data: {str(e)}")
+                        return
+                    await emit([extension_post])
+                await asyncio.gather(*(fetch(extension) for extension in extensions[:5]))
+        except Exception as e:
+            print(f"  ❌ Error scraping Chrome Web Store data: {str(e)}")
+    
+    try:
+        await asyncio.gather(scrape_reddit(), scrape_producthunt(), scrape_appstore(), scrape_chromestore())
+    finally:
+        # 通知下游抓取已结束
+        for _ in range(downstream_workers):
+            await raw_q.put(None)
+    
+    print(f"📊 Collected a total of {total} raw posts")
+    return total
 
 # Set up command line arguments
 def parse_args():
@@ -56,85 +181,41 @@ async def main():
     print(f"🔍 Market Demand Radar V2 starting...")
     print(f"📱 Will fetch data from {len(subreddits)} subreddits, with a limit of {post_limit} posts each")
     
-    # Collect raw posts
-    raw_posts = []
-    
-    # 1. Fetch data from Reddit
-    print("🔄 Fetching data from Reddit...")
-    async with RedditScraper() as reddit_scraper:
-        for subreddit_name in subreddits:
-            try:
-                print(f"  📥 Scraping r/{subreddit_name}...")
-                posts = await reddit_scraper.fetch_subreddit_posts(subreddit_name, limit=post_limit)
-                print(f"  ✅ Retrieved {len(posts)} posts from r/{subreddit_name}")
-                raw_posts.extend(posts)
-            except Exception as e:
-                print(f"  ❌ Error scraping r/{subreddit_name}: {str(e)}")
-    
-    # 2. Fetch data from Product Hunt
-    print("🔄 Fetching data from Product Hunt...")
-    try:
-        async with ProductHuntScraper() as ph_scraper:
-            ph_posts = await ph_scraper.fetch_asks(limit=post_limit)
-            print(f"  ✅ Retrieved {len(ph_posts)} posts from Product Hunt")
-            raw_posts.extend(ph_posts)
-    except Exception as e:
-        print(f"  ❌ Error scraping Product Hunt: {str(e)}")
-    
-    # 3. Fetch review data from App Store
-    print("🔄 Fetching review data from App Store...")
-    try:
-        async with AppStoreScraper() as app_scraper:
-            # Configure the list of app IDs to scrape
-            app_ids = ["1232780281", "310633997", "1274495053"]  # Examples: Notion, Evernote, Things 3
-            for app_id in app_ids:
-                app_reviews = await app_scraper.fetch_app_reviews(app_id, limit=post_limit//len(app_ids))
-                print(f"  ✅ Retrieved {len(app_reviews)} reviews from App ID {app_id}")
-                raw_posts.extend(app_reviews)
-    except Exception as e:
-        print(f"  ❌ Error scraping App Store reviews: {str(e)}")
+    # 抓取、LLM提取、竞品数据三个阶段通过队列串联并同时运行：
+    # 第一批帖子抓到后立即开始提取，提取完成的帖子立即开始补充竞品数据
+    raw_q: asyncio.Queue = asyncio.Queue()
+    extracted_q: asyncio.Queue = asyncio.Queue()
+    enriched_q: asyncio.Queue = asyncio.Queue()
     
-    # 4. Fetch data from Chrome Web Store
-    print("🔄 Fetching data from Chrome Web Store...")
-    try:
-        async with ChromeStoreScraper() as chrome_scraper:
-            # Get popular extensions
-            extensions = await chrome_scraper.fetch_top_extensions(limit=10)
-            print(f"  ✅ Retrieved {len(extensions)} popular extensions")
-            
-            # Get extension reviews
-            for extension in extensions[:5]:  # Only process the top 5 extensions
-                extension_id = extension["id"]
-                extension_post = await chrome_scraper.fetch_and_convert_to_raw_post(extension_id)
-                raw_posts.append(extension_post)
-    except Exception as e:
-        print(f"  ❌ Error scraping Chrome Web Store data: {str(e)}")
-    
-    if not raw_posts:
-        print("❌ No posts found, please check data source configuration")
-        return
-    
-    print(f"📊 Collected a total of {len(raw_posts)} raw posts, starting processing...")
-    
-    # 5. Use LLM to extract opportunity information
     if not skip_gpt:
         print("🧠 Using GPT-3.5-turbo to analyze and extract opportunity information...")
-        extractor = LLMExtractor()
-        processed_posts = await extractor.batch_extract(raw_posts)
-        print(f"  ✅ Successfully analyzed {len(processed_posts)} posts")
+        extract_handler = LLMExtractor().extract_post
     else:
         print("⏩ Skipping GPT analysis")
-        processed_posts = raw_posts
-    
-    # 6. Add competitive data
-    if not skip_competitive:
-        print("🔍 Fetching competitive data...")
-        fetcher = CompetitiveFetcher()
-        enriched_posts = await fetcher.batch_enrich_posts(processed_posts)
-        print(f"  ✅ Successfully added competitive data")
-    else:
+        extract_handler = passthrough
+    
+    if skip_competitive:
         print("⏩ Skipping competitive analysis")
-        enriched_posts = processed_posts
+    
+    # All scrapers and the competitive fetcher share one pooled client so TCP/TLS connections are reused
+    async with httpx.AsyncClient(limits=HTTP_LIMITS) as client, CompetitiveFetcher(client=client) as fetcher:
+        enrich_handler = passthrough if skip_competitive else fetcher.enrich_post_with_competitive_data
+        await asyncio.gather(
+            scrape_all(client, subreddits, post_limit, raw_q, EXTRACT_WORKERS),
+            run_stage(raw_q, extracted_q, extract_handler, EXTRACT_WORKERS, ENRICH_WORKERS),
+            run_stage(extracted_q, enriched_q, enrich_handler, ENRICH_WORKERS, 1),
+        )
+    
+    # 汇总最后一个阶段的输出（以None结尾）
+    enriched_posts = []
+    while (post := enriched_q.get_nowait()) is not None:
+        enriched_posts.append(post)
+    
+    if not enriched_posts:
+        print("❌ No posts found, please check data source configuration")
+        return
+    
+    print(f"  ✅ Successfully processed {len(enriched_posts)} posts")
     
     # 7. Calculate scores
     print("🧮 Calculating Demand×Supply scores...")
@@ -1,6 +1,5 @@
 import numpy as np
-from sklearn.tree import DecisionTreeClassifier, plot_tree
-import matplotlib.pyplot as plt
+from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import StandardScaler
 
 class PlatformRecommender:
@@ -13,6 +12,9 @@ class PlatformRecommender:
             'api_dependencies',
             'monetization_score'
         ]
+        # 各特征取值范围（顺序与feature_names一致），用于批量参数验证
+        self._min = np.array([0, 0, 1, 0, 0], dtype=np.float64)
+        self._max = np.array([1, 24, 5, 10, 1], dtype=np.float64)
         self.model = DecisionTreeClassifier(
             max_depth=3,
             criterion='gini',
@@ -20,56 +22,81 @@ class PlatformRecommender:
         )
 
     def preprocess_data(self, features):
-        """处理跨维度量纲问题"""
-        scaled = self.scaler.fit_transform(features)
+        """处理跨维度量纲问题（使用训练时拟合的均值和方差，不重新拟合）"""
+        scaled = self.scaler.transform(features)
         return np.nan_to_num(scaled)
 
-    def train_model(self, X, y):
-        """训练平台推荐模型"""
+    def train_model(self, X, y, visualize: bool = False):
+        """训练平台推荐模型（visualize=True 时额外保存决策树图片）"""
+        # 只在训练时拟合标准化参数
+        self.scaler.fit(X)
         X_processed = self.preprocess_data(X)
         self.model.fit(X_processed, y)
         
-        # 可视化决策路径
+        # 预先计算每个节点的父节点及其是否为左子节点，生成推荐理由时按父指针回溯
+        tree = self.model.tree_
+        self._parent = np.full(tree.node_count, -1, dtype=np.int64)
+        self._is_left = np.zeros(tree.node_count, dtype=bool)
+        nodes = np.arange(tree.node_count)
+        has_left = tree.children_left != -1
+        has_right = tree.children_right != -1
+        self._parent[tree.children_left[has_left]] = nodes[has_left]
+        self._is_left[tree.children_left[has_left]] = True
+        self._parent[tree.children_right[has_right]] = nodes[has_right]
+        
+        if visualize:
+            self.save_tree_plot()
+
+    def save_tree_plot(self, filename='platform_decision_tree.png'):
+        """可视化决策路径（按需导入matplotlib，不拖慢训练）"""
+        import matplotlib.pyplot as plt
+        from sklearn.tree import plot_tree
+
         plt.figure(figsize=(15,10))
         plot_tree(self.model, 
                  feature_names=self.feature_names,
                  class_names=['Browser Extension','Desktop','Mobile'],
                  filled=True,
                  rounded=True)
-        plt.savefig('platform_decision_tree.png')
+        plt.savefig(filename)
         plt.close()
 
     def recommend_platform(self, features):
-        """执行平台推荐"""
-        REQUIRED_FEATURES = {
-            'mobile_user_ratio': (0, 1),
-            'desktop_usage': (0, 24),
-            'tech_complexity': (1, 5),
-            'api_dependencies': (0, 10),
-            'monetization_score': (0, 1)
-        }
+        """
+        执行平台推荐
+        features 可以是单个特征字典，也可以是 (N, 5) 的特征矩阵（列顺序同feature_names）；
+        前者返回单个推荐结果，后者返回结果列表
+        """
+        single = isinstance(features, dict)
+        if single:
+            # 转换为特征向量
+            X = np.array([[features[key] for key in self.feature_names]], dtype=np.float64)
+        else:
+            X = np.atleast_2d(np.asarray(features, dtype=np.float64))
 
-        # 参数验证
-        for fname, (min_val, max_val) in REQUIRED_FEATURES.items():
-            if not (min_val <= features[fname] <= max_val):
-                raise ValueError(f'{fname}参数越界: 应在{min_val}-{max_val}之间')
+        # 参数验证：整批一次比较
+        bad_rows, bad_cols = np.nonzero((X < self._min) | (X > self._max))
+        if bad_cols.size:
+            idx = bad_cols[0]
+            raise ValueError(f'{self.feature_names[idx]}参数越界: 应在{self._min[idx]:g}-{self._max[idx]:g}之间')
 
-        # 转换为特征向量
-        X = np.array([[features[key] for key in self.feature_names]])
         X_processed = self.preprocess_data(X)
         
         pred = self.model.predict(X_processed)
         proba = self.model.predict_proba(X_processed)
         
         # 生成推荐理由
-        node_indicator = self.model.decision_path(X_processed)
-        leaf_id = self.model.apply(X_processed)[0]
+        leaf_ids = self.model.apply(X_processed)
         
-        return {
-            'platform': pred[0],
-            'confidence': np.max(proba),
-            'reasoning': self._get_decision_rules(leaf_id)
-        }
+        results = [
+            {
+                'platform': platform,
+                'confidence': confidence,
+                'reasoning': self._get_decision_rules(leaf_id)
+            }
+            for platform, confidence, leaf_id in zip(pred, proba.max(axis=1), leaf_ids)
+        ]
+        return results[0] if single else results
 
     def _get_decision_rules(self, leaf_id):
         """解析决策树路径生成自然语言解释"""
@@ -80,13 +107,8 @@ class PlatformRecommender:
         decision_path = []
         node = leaf_id
         while node != 0:
-            parent = np.where(tree.children_left == node)[0]
-            if len(parent) == 0:
-                parent = np.where(tree.children_right == node)[0][0]
-                op = '>'
-            else:
-                parent = parent[0]
-                op = '<='
+            parent = self._parent[node]
+            op = '<=' if self._is_left[node] else '>'
             
             feat_name = self.feature_names[features[parent]]
             threshold = thresholds[parent]
@@ -106,7 +128,7 @@ if __name__ == '__main__':
     y_train = ['Mobile', 'Desktop', 'Browser']
     
     recommender = PlatformRecommender()
-    recommender.train_model(X_train, y_train)
+    recommender.train_model(X_train, y_train, visualize=True)
     
     # 新案例预测
     test_case = {
@@ -1,6 +1,52 @@
 import numpy as np
 from datetime import datetime, timedelta
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# numba为可选依赖：安装后评分内核编译为机器码，否则使用NumPy实现
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+def _score_batch_numpy(post_scores, sentiments, days_old, existing_apps, rating_avg,
+                       max_post_score, recency_days, max_apps, max_rating):
+    """批量计算需求分数、供应分数和黄金区域 (NumPy实现)"""
+    # 需求分数：归一化点赞数 × 情感(0-1) × 时间衰减因子
+    normalized_score = np.minimum(100, post_scores / max_post_score * 100)
+    recency_factor = np.maximum(0, 1 - days_old / recency_days)
+    demand = normalized_score * (sentiments + 1) / 2 * recency_factor
+    
+    # 供应分数：归一化应用数量 × 归一化评分
+    supply = np.minimum(100, existing_apps / max_apps * 100) * (rating_avg / max_rating)
+    
+    # 黄金区域：Demand ≥ 70 & Supply ≤ 30
+    return demand, supply, (demand >= 70) & (supply <= 30)
+
+if njit is not None:
+    # 显式签名使内核在导入时编译（cache=True 会缓存到磁盘），避免首次调用时的JIT延迟
+    @njit("Tuple((f8[:], f8[:], b1[:]))(f8[:], f8[:], f8[:], i8[:], f8[:], f8, f8, f8, f8)",
+          cache=True, fastmath=True, parallel=True)
+    def _score_batch(post_scores, sentiments, days_old, existing_apps, rating_avg,
+                     max_post_score, recency_days, max_apps, max_rating):
+        """批量计算需求分数、供应分数和黄金区域 (numba单循环，不产生中间数组)"""
+        n = post_scores.shape[0]
+        demand = np.empty(n)
+        supply = np.empty(n)
+        gold = np.empty(n, dtype=np.bool_)
+        for i in prange(n):
+            normalized_score = min(100.0, post_scores[i] / max_post_score * 100)
+            recency_factor = max(0.0, 1 - days_old[i] / recency_days)
+            demand[i] = normalized_score * (sentiments[i] + 1) / 2 * recency_factor
+            supply[i] = min(100.0, existing_apps[i] / max_apps * 100) * (rating_avg[i] / max_rating)
+            gold[i] = demand[i] >= 70 and supply[i] <= 30
+        return demand, supply, gold
+else:
+    _score_batch = _score_batch_numpy
+
 class DemandSupplyScorer:
     """
     Demand × Supply 评分引擎
@@ -16,6 +62,9 @@ class DemandSupplyScorer:
         self.recency_days = 30      # 时间衰减窗口
         self.max_apps = 50          # 假设最大竞品数量
         self.max_rating = 5.0       # 评分满分
+        
+        # 模拟竞品数据的随机数生成器，整批一次性抽样
+        self.rng = np.random.default_rng()
     
     def calculate_demand_score(self, post_score, sentiment, created_date):
         """
@@ -65,47 +114,72 @@ class DemandSupplyScorer:
         """
         return demand_score >= 70 and supply_score <= 30
     
-    def get_opportunity_matrix(self, ideas_list):
+    def _sentiment(self, analysis):
+        """从GPT分析中提取情感因素 (默认0.5为中性)"""
+        if isinstance(analysis, (str, bytes)):
+            # 旧格式为JSON字符串，解析一次后直接读取布尔字段
+            try:
+                analysis = _json.loads(analysis)
+            except ValueError:
+                analysis = None
+        if not isinstance(analysis, dict):
+            return 0.5  # 默认中性
+        
+        sentiment = 0.8 if analysis.get('unmet_need') else 0.5  # 存在未满足需求时提高情感分数
+        if analysis.get('monetizable'):
+            sentiment += 0.1  # 额外加分
+        return min(1.0, sentiment)  # 确保不超过1.0
+    
+    def get_opportunity_matrix(self, ideas_list, top_k=None):
         """
         为想法列表生成机会矩阵
+        所有想法的分数在NumPy数组上一次性计算，再写回各个想法
+        
+        Args:
+            ideas_list: 想法列表
+            top_k: 只返回需求分数最高的前top_k个想法，None表示返回全部
         """
-        results = []
+        n = len(ideas_list)
+        if n == 0:
+            return []
+        
+        # 提取必要数据
+        now = datetime.now()
+        default_date = now - timedelta(days=7)
+        post_scores = np.fromiter((idea.get('score', 0) for idea in ideas_list), dtype=float, count=n)
+        sentiments = np.fromiter((self._sentiment(idea.get('gpt_analysis')) for idea in ideas_list), dtype=float, count=n)
+        days_old = np.fromiter(((now - idea.get('created_date', default_date)).days for idea in ideas_list), dtype=float, count=n)
+        
+        # 竞品数据：优先使用CompetitiveFetcher补充的真实数据，缺失时使用随机模拟
+        existing_apps = self.rng.integers(0, 30, size=n)  # 随机模拟竞品数量
+        rating_avg = self.rng.uniform(2.5, 4.8, size=n)  # 随机模拟评分
+        for i, idea in enumerate(ideas_list):
+            competitive_data = idea.get('competitive_data')
+            if competitive_data:
+                existing_apps[i] = competitive_data.get('app_count', existing_apps[i])
+                rating_avg[i] = competitive_data.get('avg_rating', rating_avg[i])
+        
+        demand_scores, supply_scores, gold_zone = _score_batch(
+            post_scores, sentiments, days_old, existing_apps.astype(np.int64), rating_avg,
+            float(self.max_post_score), float(self.recency_days), float(self.max_apps), float(self.max_rating)
+        )
         
-        for idea in ideas_list:
-            # 提取必要数据
-            post_score = idea.get('score', 0)
-            
-            # 从GPT分析中提取情感因素
-            sentiment = 0.5  # 默认中性
-            if 'gpt_analysis' in idea:
-                analysis = idea['gpt_analysis'].lower()
-                if 'unmet_need": true' in analysis:
-                    sentiment = 0.8  # 提高情感分数
-                if 'monetizable": true' in analysis:
-                    sentiment += 0.1  # 额外加分
-                sentiment = min(1.0, sentiment)  # 确保不超过1.0
-            
-            # 创建日期
-            created_date = idea.get('created_date', datetime.now() - timedelta(days=7))
-            
-            # 假设的竞品数据 (实际应用中应从App Store/Chrome Store获取)
-            # 这里使用简单模拟，实际实现应该连接到competitive_analysis.py
-            existing_apps = np.random.randint(0, 30)  # 随机模拟竞品数量
-            rating_avg = np.random.uniform(2.5, 4.8)  # 随机模拟评分
-            
-            # 计算分数
-            demand_score = self.calculate_demand_score(post_score, sentiment, created_date)
-            supply_score = self.calculate_supply_score(existing_apps, rating_avg)
-            
-            # 添加到结果
-            idea['demand_score'] = round(demand_score, 1)
-            idea['supply_score'] = round(supply_score, 1)
-            idea['gold_zone'] = self.is_gold_zone(demand_score, supply_score)
-            
-            results.append(idea)
+        # 写回结果
+        demand_rounded = np.round(demand_scores, 1)
+        for idea, demand, supply, gold in zip(ideas_list, demand_rounded.tolist(), np.round(supply_scores, 1).tolist(), gold_zone.tolist()):
+            idea['demand_score'] = demand
+            idea['supply_score'] = supply
+            idea['gold_zone'] = gold
         
-        # 按需求分数排序
-        return sorted(results, key=lambda x: x['demand_score'], reverse=True)
+        # 按需求分数排序；只需要前top_k个时先用argpartition选出候选（O(N)），只对这部分排序
+        if top_k is not None and top_k < n:
+            if top_k <= 0:
+                return []
+            candidates = np.argpartition(-demand_rounded, top_k - 1)[:top_k]
+            order = candidates[np.lexsort((candidates, -demand_rounded[candidates]))]
+        else:
+            order = np.argsort(-demand_rounded, kind='stable')
+        return [ideas_list[i] for i in order]
 
 # 示例用法
 if __name__ == '__main__':
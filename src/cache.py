@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache Module
+
+基于单个SQLite文件的键值缓存，支持过期时间（TTL）
+替代每个条目一个JSON文件的缓存方式，命中时只需一次索引查询
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+# 优先使用orjson序列化（编码/解码更快），未安装时退回标准库json
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+    _loads = json.loads
+
+# 默认缓存文件位置（项目根目录下的cache目录）
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "cache.sqlite3")
+
+class SQLiteCache:
+    """
+    SQLite键值缓存
+    值以JSON字节串存储，过期条目在读取时视为未命中
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        初始化缓存
+
+        Args:
+            path: SQLite数据库文件路径
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # 连接可能被 aget/aset 的工作线程同时使用，读写串行化
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的值，未命中或已过期时返回None
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的值
+            ttl: 有效期（秒）
+        """
+        payload = _dumps(value)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + ttl)
+            )
+            self.conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        删除所有已过期的条目
+
+        Returns:
+            删除的条目数量
+        """
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            self.conn.commit()
+        return cursor.rowcount
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """异步读取缓存，查询在工作线程中执行，不阻塞事件循环"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: float) -> None:
+        """异步写入缓存，写入和提交在工作线程中执行，不阻塞事件循环"""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self.conn.close()
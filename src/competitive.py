@@ -9,15 +9,61 @@ Competitive Fetcher Module
 """
 
 import asyncio
+import re
 import httpx
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-import json
-import os
+import numpy as np
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 
 # 导入爬虫模块
 from src.scrapers.appstore_scraper import AppStoreScraper
 from src.scrapers.chromestore_scraper import ChromeStoreScraper
+from src.cache import SQLiteCache
+from src.keywords import build_keyword_matcher
+
+# 竞品数据缓存有效期（1天）
+CACHE_TTL = 86400
+
+# 标题关键词：长度至少为4的英文单词（同时去掉标点）
+_KEYWORD_PATTERN = re.compile(r"[A-Za-z]{4,}")
+
+@dataclass
+class CompetitorBatch:
+    """
+    竞品搜索结果（结构数组形式）
+    ID、名称和评分分别存储，排序和统计直接在NumPy数组上完成
+    """
+    ids: List[str]
+    names: List[str]
+    ratings: np.ndarray
+    records: List[Dict[str, Any]]  # 原始竞品数据，按需序列化
+    
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "CompetitorBatch":
+        """根据ID去重，保留首次出现的竞品"""
+        unique_by_id: Dict[str, Dict[str, Any]] = {}
+        for comp in records:
+            comp_id = comp.get("id", "")
+            if comp_id and comp_id not in unique_by_id:
+                unique_by_id[comp_id] = comp
+        unique = list(unique_by_id.values())
+        return cls(
+            ids=[comp["id"] for comp in unique],
+            names=[comp.get("name", "") for comp in unique],
+            ratings=np.fromiter((comp.get("rating") or 0 for comp in unique), dtype=float, count=len(unique)),
+            records=unique
+        )
+    
+    def to_dict(self, top_k: int = 10) -> Dict[str, Any]:
+        """序列化为对外的字典格式（按评分降序，只返回前top_k个竞品）"""
+        order = np.argsort(-self.ratings, kind="stable")[:top_k]
+        return {
+            "app_count": len(self.ids),
+            "avg_rating": round(float(self.ratings.mean()), 1) if self.ratings.size else 0,
+            "competitors": [self.records[i] for i in order]
+        }
 
 class CompetitiveFetcher:
     """
@@ -33,24 +79,86 @@ class CompetitiveFetcher:
             client: 可选的httpx异步客户端，如果不提供则创建新的
         """
         self.client = client
+        # 只关闭自己创建的客户端
+        self.owns_client = client is None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36",
             "Accept": "application/json"
         }
         
-        # 缓存目录
-        self.cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache")
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        # 限制同时进行的竞品查询数量，避免触发上游限流
+        self._sem = asyncio.Semaphore(16)
+        
+        # 抓取器在首次使用时创建（见_appstore/_chromestore），不要求必须使用async with
+        self._appstore_scraper: Optional[AppStoreScraper] = None
+        self._chromestore_scraper: Optional[ChromeStoreScraper] = None
+        
+        # 缓存（单个SQLite文件，按键查询并自带过期时间）
+        self.cache = SQLiteCache()
+        # 每个缓存键一把锁：同一键的并发请求只有一个真正发起抓取，其余等待后直接命中缓存
+        self._cache_locks = defaultdict(asyncio.Lock)
     
-    async def __aenter__(self):
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取HTTP客户端，首次调用时创建"""
         if self.client is None:
-            self.client = httpx.AsyncClient(headers=self.headers)
+            # 长连接池 + HTTP/2，所有查询复用已建立的TCP/TLS连接
+            self.client = httpx.AsyncClient(
+                headers=self.headers,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=30.0
+            )
+        return self.client
+    
+    @property
+    def _appstore(self) -> AppStoreScraper:
+        """App Store抓取器，首次使用时创建，共享同一个客户端（不负责关闭它）"""
+        if self._appstore_scraper is None:
+            self._appstore_scraper = AppStoreScraper(client=self._get_client())
+        return self._appstore_scraper
+    
+    @property
+    def _chromestore(self) -> ChromeStoreScraper:
+        """Chrome Store抓取器，首次使用时创建，共享同一个客户端（不负责关闭它）"""
+        if self._chromestore_scraper is None:
+            self._chromestore_scraper = ChromeStoreScraper(client=self._get_client())
+        return self._chromestore_scraper
+    
+    async def aclose(self):
+        """关闭自己创建的HTTP客户端"""
+        if self.owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self._appstore_scraper = None
+            self._chromestore_scraper = None
+    
+    async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client is not None:
-            await self.client.aclose()
+        await self.aclose()
+        self.cache.close()
+    
+    async def _cached(self, key: str, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        先查缓存，未命中时调用fetch获取数据并写入缓存
+        
+        Args:
+            key: 缓存键
+            ttl: 有效期（秒）
+            fetch: 返回待缓存数据的协程函数；抛出异常时不写缓存
+            
+        Returns:
+            缓存或新获取的数据
+        """
+        async with self._cache_locks[key]:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+            
+            data = await fetch()
+            await self.cache.aset(key, data, ttl)
+            return data
     
     async def get_app_store_rating_trend(self, app_id: str, months: int = 6) -> Dict[str, Any]:
         """
@@ -63,15 +171,6 @@ class CompetitiveFetcher:
         Returns:
             评分趋势数据
         """
-        # 检查缓存
-        cache_file = os.path.join(self.cache_dir, f"appstore_{app_id}_trend.json")
-        if os.path.exists(cache_file):
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
-                # 检查缓存是否过期（1天）
-                if datetime.fromisoformat(cache_data["cached_at"]) > datetime.now() - timedelta(days=1):
-                    return cache_data["data"]
-        
         # 初始化结果
         result = {
             "app_id": app_id,
@@ -81,60 +180,55 @@ class CompetitiveFetcher:
             "trend": "stable"  # stable, up, down
         }
         
-        try:
-            # 使用AppStoreScraper获取评分数据
-            async with AppStoreScraper(client=self.client) as scraper:
-                # 获取当前评分
-                app_details = await scraper.fetch_app_details(app_id)
-                current_rating = app_details.get("averageUserRating", 0)
-                rating_count = app_details.get("userRatingCount", 0)
-                
-                result["avg_rating"] = current_rating
-                result["rating_count"] = rating_count
-                
-                # 获取历史评分（模拟数据，实际应从历史API获取）
-                # 由于App Store不提供历史评分API，这里使用模拟数据
-                today = datetime.now()
-                ratings = []
-                
-                # 生成过去几个月的模拟数据
-                for i in range(months):
-                    month_date = today - timedelta(days=30*i)
-                    # 模拟评分波动（实际应从数据库或其他来源获取）
-                    month_rating = max(1, min(5, current_rating + (0.1 * (i % 3 - 1))))
-                    
-                    ratings.append({
-                        "date": month_date.strftime("%Y-%m"),
-                        "rating": round(month_rating, 1)
-                    })
-                
-                # 反转顺序，使最早的日期在前
-                ratings.reverse()
-                result["ratings"] = ratings
-                
-                # 计算趋势
-                if len(ratings) >= 2:
-                    first_rating = ratings[0]["rating"]
-                    last_rating = ratings[-1]["rating"]
-                    
-                    if last_rating - first_rating > 0.2:
-                        result["trend"] = "up"
-                    elif first_rating - last_rating > 0.2:
-                        result["trend"] = "down"
+        async def fetch():
+            # 使用AppStoreScraper获取当前评分
+            app_details = await self._appstore.fetch_app_details(app_id)
+            current_rating = app_details.get("averageUserRating", 0)
+            rating_count = app_details.get("userRatingCount", 0)
             
-            # 缓存结果
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump({
-                    "cached_at": datetime.now().isoformat(),
-                    "data": result
-                }, f)
+            result["avg_rating"] = current_rating
+            result["rating_count"] = rating_count
             
-            return result
+            # 获取历史评分（模拟数据，实际应从历史API获取）
+            # 由于App Store不提供历史评分API，这里使用模拟数据，一次性生成过去几个月的数据
+            result["ratings"], result["trend"] = self._synthetic_rating_history(current_rating, months)
             
+            return result
+        
+        try:
+            return await self._cached(f"appstore:{app_id}:trend", CACHE_TTL, fetch)
         except Exception as e:
             print(f"获取App Store评分趋势时出错: {str(e)}")
             return result
     
+    @staticmethod
+    def _synthetic_rating_history(current_rating: float, months: int):
+        """
+        生成过去几个月的模拟评分（实际应从数据库或其他来源获取）及趋势
+        
+        Returns:
+            (按日期升序的评分列表, 趋势 "stable"/"up"/"down")
+        """
+        offsets = np.arange(months)[::-1]  # 最早的月份在前
+        dates = np.datetime64(datetime.now().date()) - offsets * np.timedelta64(30, "D")
+        # 模拟评分波动
+        ratings = np.round(np.clip(current_rating + 0.1 * (offsets % 3 - 1), 1, 5), 1)
+        
+        history = [
+            {"date": date, "rating": rating}
+            for date, rating in zip(dates.astype("datetime64[M]").astype(str).tolist(), ratings.tolist())
+        ]
+        
+        # 计算趋势
+        trend = "stable"
+        if months >= 2:
+            change = ratings[-1] - ratings[0]
+            if change > 0.2:
+                trend = "up"
+            elif change < -0.2:
+                trend = "down"
+        return history, trend
+    
     async def get_chrome_store_stats(self, extension_id: str) -> Dict[str, Any]:
         """
         获取Chrome Web Store扩展统计数据
@@ -145,15 +239,6 @@ class CompetitiveFetcher:
         Returns:
             扩展统计数据
         """
-        # 检查缓存
-        cache_file = os.path.join(self.cache_dir, f"chromestore_{extension_id}_stats.json")
-        if os.path.exists(cache_file):
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
-                # 检查缓存是否过期（1天）
-                if datetime.fromisoformat(cache_data["cached_at"]) > datetime.now() - timedelta(days=1):
-                    return cache_data["data"]
-        
         # 初始化结果
         result = {
             "extension_id": extension_id,
@@ -163,25 +248,19 @@ class CompetitiveFetcher:
             "last_updated": ""
         }
         
-        try:
+        async def fetch():
             # 使用ChromeStoreScraper获取扩展数据
-            async with ChromeStoreScraper(client=self.client) as scraper:
-                extension_details = await scraper.fetch_extension_details(extension_id)
-                
-                result["users"] = extension_details.get("users", 0)
-                result["rating"] = extension_details.get("rating", 0)
-                result["rating_count"] = len(extension_details.get("reviews", []))
-                result["last_updated"] = extension_details.get("updated_date", "")
+            extension_details = await self._chromestore.fetch_extension_details(extension_id)
             
-            # 缓存结果
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump({
-                    "cached_at": datetime.now().isoformat(),
-                    "data": result
-                }, f)
+            result["users"] = extension_details.get("users", 0)
+            result["rating"] = extension_details.get("rating", 0)
+            result["rating_count"] = len(extension_details.get("reviews", []))
+            result["last_updated"] = extension_details.get("updated_date", "")
             
             return result
-            
+        
+        try:
+            return await self._cached(f"chromestore:{extension_id}:stats", CACHE_TTL, fetch)
         except Exception as e:
             print(f"获取Chrome Store统计数据时出错: {str(e)}")
             return result
@@ -197,62 +276,41 @@ class CompetitiveFetcher:
         Returns:
             竞品数据
         """
-        result = {
-            "app_count": 0,
-            "avg_rating": 0,
-            "competitors": []
-        }
-        
         competitors = []
         
         # 根据平台选择搜索范围
         if platform in ["appstore", "all"]:
             try:
-                # 搜索App Store
-                async with AppStoreScraper(client=self.client) as scraper:
-                    for keyword in keywords:
-                        apps = await scraper.search_apps(keyword, limit=5)
-                        competitors.extend(apps)
+                # 搜索App Store（所有关键词并发搜索）
+                results = await asyncio.gather(
+                    *(self._appstore.search_apps(keyword, limit=5) for keyword in keywords),
+                    return_exceptions=True
+                )
+                for apps in results:
+                    if isinstance(apps, Exception):
+                        print(f"搜索App Store竞品时出错: {str(apps)}")
+                        continue
+                    competitors.extend(apps)
             except Exception as e:
                 print(f"搜索App Store竞品时出错: {str(e)}")
         
         if platform in ["chromestore", "all"]:
             try:
                 # 搜索Chrome Web Store
-                async with ChromeStoreScraper(client=self.client) as scraper:
-                    # 获取热门扩展，然后筛选关键词
-                    extensions = await scraper.fetch_top_extensions(limit=100)
-                    
-                    # 简单关键词匹配（实际应使用更复杂的相关性算法）
-                    for extension in extensions:
-                        name = extension.get("name", "").lower()
-                        if any(keyword.lower() in name for keyword in keywords):
-                            competitors.append(extension)
+                # 获取热门扩展，然后筛选关键词
+                extensions = await self._chromestore.fetch_top_extensions(limit=100)
+                
+                # 简单关键词匹配（实际应使用更复杂的相关性算法），自动机每次搜索只构建一次
+                matches_keyword = build_keyword_matcher(keywords)
+                competitors.extend(
+                    extension for extension in extensions
+                    if matches_keyword(extension.get("name", ""))
+                )
             except Exception as e:
                 print(f"搜索Chrome Store竞品时出错: {str(e)}")
         
-        # 去重（根据ID）
-        unique_competitors = []
-        unique_ids = set()
-        
-        for comp in competitors:
-            comp_id = comp.get("id", "")
-            if comp_id and comp_id not in unique_ids:
-                unique_ids.add(comp_id)
-                unique_competitors.append(comp)
-        
-        # 计算统计数据
-        result["app_count"] = len(unique_competitors)
-        
-        if unique_competitors:
-            total_rating = sum(comp.get("rating", 0) for comp in unique_competitors)
-            result["avg_rating"] = round(total_rating / len(unique_competitors), 1)
-        
-        # 按评分排序
-        unique_competitors.sort(key=lambda x: x.get("rating", 0), reverse=True)
-        result["competitors"] = unique_competitors[:10]  # 只返回前10个
-        
-        return result
+        # 去重（根据ID）、统计并按评分排序
+        return CompetitorBatch.from_records(competitors).to_dict()
     
     async def enrich_post_with_competitive_data(self, post: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -265,29 +323,24 @@ class CompetitiveFetcher:
             添加了竞品数据的帖子
         """
         # 从帖子中提取关键词
-        keywords = []
-        
-        # 从标题中提取
-        title = post.get("title", "")
-        if title:
-            # 简单分词（实际应使用NLP库）
-            words = title.split()
-            keywords.extend([word for word in words if len(word) > 3])
+        # 从标题中提取（简单正则分词，实际应使用NLP库）
+        keywords = _KEYWORD_PATTERN.findall(post.get("title", "") or "")
         
         # 从机会标签中提取
         opportunity = post.get("opportunity", {})
         tags = opportunity.get("tags", [])
         keywords.extend(tags)
         
-        # 去重和限制数量
-        keywords = list(set(keywords))[:5]
+        # 去重（忽略大小写）和限制数量，保留首次出现的顺序
+        keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))[:5]
         
         if not keywords:
             # 如果没有提取到关键词，使用默认关键词
             keywords = ["app", "tool"]
         
         # 搜索竞品
-        competitive_data = await self.search_competitors(keywords)
+        async with self._sem:
+            competitive_data = await self.search_competitors(keywords)
         
         # 添加到帖子
         post["competitive_data"] = competitive_data
@@ -304,13 +357,10 @@ class CompetitiveFetcher:
         Returns:
             添加了竞品数据的帖子列表
         """
-        enriched_posts = []
-        
-        for post in posts:
-            enriched_post = await self.enrich_post_with_competitive_data(post)
-            enriched_posts.append(enriched_post)
-        
-        return enriched_posts
+        # 所有帖子并发查询，并发数由信号量限制
+        return list(await asyncio.gather(
+            *(self.enrich_post_with_competitive_data(post) for post in posts)
+        ))
 
 # 使用示例
 async def main():
@@ -323,16 +373,16 @@ async def main():
         }
     }
     
-    fetcher = CompetitiveFetcher()
-    enriched_post = await fetcher.enrich_post_with_competitive_data(test_post)
-    
-    print(f"竞品数量: {enriched_post['competitive_data']['app_count']}")
-    print(f"平均评分: {enriched_post['competitive_data']['avg_rating']}")
-    
-    # 测试App Store评分趋势
-    # 使用实际的App ID，这里使用Notion的ID作为示例
-    app_trend = await fetcher.get_app_store_rating_trend("1232780281")
-    print(f"Notion评分趋势: {app_trend['trend']}")
+    async with CompetitiveFetcher() as fetcher:
+        enriched_post = await fetcher.enrich_post_with_competitive_data(test_post)
+        
+        print(f"竞品数量: {enriched_post['competitive_data']['app_count']}")
+        print(f"平均评分: {enriched_post['competitive_data']['avg_rating']}")
+        
+        # 测试App Store评分趋势
+        # 使用实际的App ID，这里使用Notion的ID作为示例
+        app_trend = await fetcher.get_app_store_rating_trend("1232780281")
+        print(f"Notion评分趋势: {app_trend['trend']}")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
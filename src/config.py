@@ -8,13 +8,17 @@
 """
 
 import os
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Final, Literal, Mapping, Optional, Tuple
 
 # 基础配置
 PROJECT_NAME = "Market Demand Radar"
 VERSION = "2.0.0"
-CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache")
-REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "reports")
+# 项目根目录（src的上一级）
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(_ROOT, "cache")
+REPORTS_DIR = os.path.join(_ROOT, "reports")
 
 # 确保必要的目录存在
 os.makedirs(CACHE_DIR, exist_ok=True)
@@ -35,7 +39,7 @@ DEFAULT_POST_LIMIT = 25
 LLM_MODEL = "gpt-3.5-turbo"
 LLM_TEMPERATURE = 0.2
 LLM_MAX_TOKENS = 500
-LLM_PROMPT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "prompts/opportunity_v2.txt")
+LLM_PROMPT_TEMPLATE_PATH = os.path.join(_ROOT, "prompts", "opportunity_v2.txt")
 
 # 评分引擎配置
 SCORING_CONFIG = {
@@ -71,6 +75,12 @@ APPSTORE_APP_IDS = {
     ]
 }
 
+# 展开为平行元组（ID、名称），抓取时直接zip遍历，无需嵌套遍历字典
+_APP_ENTRIES = [(app["id"], app["name"]) for apps in APPSTORE_APP_IDS.values() for app in apps]
+APPSTORE_IDS: Final[Tuple[str, ...]] = tuple(entry[0] for entry in _APP_ENTRIES)
+APPSTORE_NAMES: Final[Tuple[str, ...]] = tuple(entry[1] for entry in _APP_ENTRIES)
+del _APP_ENTRIES
+
 # 抓取器通用配置
 SCRAPER_CONFIG = {
     "retry_attempts": 3,
@@ -123,51 +133,131 @@ EMAIL_CONFIG = {
     "recipient_list": []  # 在生产环境中填充
 }
 
-def get_config() -> Dict[str, Any]:
+# 配置结构校验（在validate_config中对SCORING_CONFIG和EMAIL_CONFIG做一次整体校验）
+# pydantic只用于校验，在首次校验时才导入，未安装时跳过结构校验
+@lru_cache(maxsize=1)
+def _config_model() -> Optional[type]:
     """
-    获取完整的配置字典
+    构建配置校验模型
     
     Returns:
-        包含所有配置项的字典
+        ConfigModel类，未安装pydantic时返回None
     """
-    return {
+    try:
+        from pydantic import BaseModel, Field
+    except ImportError:
+        return None
+    
+    class DemandScoreFormula(BaseModel):
+        post_score_weight: float = Field(ge=0)
+        sentiment_weight: float = Field(ge=0)
+        velocity_weight: float = Field(ge=0)
+
+    class SupplyScoreFormula(BaseModel):
+        app_count_weight: float = Field(ge=0)
+        avg_rating_weight: float = Field(ge=0)
+
+    class GoldZoneCriteria(BaseModel):
+        min_opportunity_score: float
+        min_demand_score: float = Field(ge=0, le=100)
+        max_supply_score: float = Field(ge=0, le=100)
+
+    class ScoringConfigModel(BaseModel):
+        demand_score_formula: DemandScoreFormula
+        supply_score_formula: SupplyScoreFormula
+        gold_zone_criteria: GoldZoneCriteria
+
+    class EmailConfigModel(BaseModel):
+        send_day: Literal["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        send_hour: int = Field(ge=0, le=23)
+        send_timezone: str
+        sender_email: Optional[str] = None
+        smtp_server: str
+        smtp_port: int = Field(ge=1, le=65535)
+        smtp_username: Optional[str] = None
+        smtp_password: Optional[str] = None
+        subject_template: str
+        recipient_list: List[str]
+
+    class ConfigModel(BaseModel):
+        scoring: ScoringConfigModel
+        email: EmailConfigModel
+    
+    return ConfigModel
+
+def _freeze(value: Any) -> Any:
+    """递归转换为只读结构：字典转为MappingProxyType，列表转为元组"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# get_config中的分组配置（只由上面的常量组成，导入时构建一次）
+_API_KEYS: Final[Mapping[str, Optional[str]]] = _freeze({
+    "openai": OPENAI_API_KEY,
+    "reddit_client_id": REDDIT_CLIENT_ID,
+    "reddit_client_secret": REDDIT_CLIENT_SECRET,
+    "producthunt": PRODUCTHUNT_API_KEY
+})
+_REDDIT: Final[Mapping[str, Any]] = _freeze({
+    "default_subreddits": DEFAULT_SUBREDDITS,
+    "default_post_limit": DEFAULT_POST_LIMIT,
+    "user_agent": REDDIT_USER_AGENT
+})
+_LLM: Final[Mapping[str, Any]] = _freeze({
+    "model": LLM_MODEL,
+    "temperature": LLM_TEMPERATURE,
+    "max_tokens": LLM_MAX_TOKENS,
+    "prompt_template_path": LLM_PROMPT_TEMPLATE_PATH
+})
+_APPSTORE: Final[Mapping[str, Any]] = _freeze({
+    "app_ids": APPSTORE_APP_IDS,
+    "ids": APPSTORE_IDS,
+    "names": APPSTORE_NAMES
+})
+
+_SCORING: Final[Mapping[str, Any]] = _freeze(SCORING_CONFIG)
+_SCRAPER: Final[Mapping[str, Any]] = _freeze(SCRAPER_CONFIG)
+_REPORT: Final[Mapping[str, Any]] = _freeze(REPORT_CONFIG)
+_DASHBOARD: Final[Mapping[str, Any]] = _freeze(DASHBOARD_CONFIG)
+_EMAIL: Final[Mapping[str, Any]] = _freeze(EMAIL_CONFIG)
+
+@lru_cache(maxsize=1)
+def get_config() -> Mapping[str, Any]:
+    """
+    获取完整的配置
+    配置在运行期间不变，只构建一次，之后返回同一个只读视图
+    各分组是模块常量的只读副本（字典为MappingProxyType，列表为元组），
+    修改返回值会抛出TypeError；返回值不能直接json.dumps，需要时先转换为普通dict/list
+    
+    Returns:
+        包含所有配置项的只读映射
+    """
+    return MappingProxyType({
         "project_name": PROJECT_NAME,
         "version": VERSION,
         "cache_dir": CACHE_DIR,
         "reports_dir": REPORTS_DIR,
-        "api_keys": {
-            "openai": OPENAI_API_KEY,
-            "reddit_client_id": REDDIT_CLIENT_ID,
-            "reddit_client_secret": REDDIT_CLIENT_SECRET,
-            "producthunt": PRODUCTHUNT_API_KEY
-        },
-        "reddit": {
-            "default_subreddits": DEFAULT_SUBREDDITS,
-            "default_post_limit": DEFAULT_POST_LIMIT,
-            "user_agent": REDDIT_USER_AGENT
-        },
-        "llm": {
-            "model": LLM_MODEL,
-            "temperature": LLM_TEMPERATURE,
-            "max_tokens": LLM_MAX_TOKENS,
-            "prompt_template_path": LLM_PROMPT_TEMPLATE_PATH
-        },
-        "scoring": SCORING_CONFIG,
-        "appstore": {
-            "app_ids": APPSTORE_APP_IDS
-        },
-        "scraper": SCRAPER_CONFIG,
-        "report": REPORT_CONFIG,
-        "dashboard": DASHBOARD_CONFIG,
-        "email": EMAIL_CONFIG
-    }
+        "api_keys": _API_KEYS,
+        "reddit": _REDDIT,
+        "llm": _LLM,
+        "scoring": _SCORING,
+        "appstore": _APPSTORE,
+        "scraper": _SCRAPER,
+        "report": _REPORT,
+        "dashboard": _DASHBOARD,
+        "email": _EMAIL
+    })
 
-def validate_config() -> List[str]:
+@lru_cache(maxsize=1)
+def validate_config() -> Tuple[str, ...]:
     """
     验证配置是否完整和有效
+    配置和目录在运行期间不变，只检查一次
     
     Returns:
-        问题列表，如果没有问题则为空列表
+        问题元组，如果没有问题则为空元组
     """
     issues = []
     
@@ -181,24 +271,36 @@ def validate_config() -> List[str]:
     if not os.path.exists(REPORTS_DIR):
         issues.append(f"Reports directory does not exist: {REPORTS_DIR}")
     
+    # 检查评分和邮件配置的结构和取值
+    config_model = _config_model()
+    if config_model is not None:
+        from pydantic import ValidationError
+        try:
+            config_model(scoring=SCORING_CONFIG, email=EMAIL_CONFIG)
+        except ValidationError as e:
+            for error in e.errors():
+                location = ".".join(str(part) for part in error["loc"])
+                issues.append(f"Invalid config value {location}: {error['msg']}")
+    
     # 检查LLM提示词模板
     if not os.path.exists(LLM_PROMPT_TEMPLATE_PATH):
         issues.append(f"LLM prompt template file not found: {LLM_PROMPT_TEMPLATE_PATH}")
     
-    return issues
+    return tuple(issues)
 
-def get_api_status() -> Dict[str, bool]:
+@lru_cache(maxsize=1)
+def get_api_status() -> Mapping[str, bool]:
     """
     获取各API的可用状态
     
     Returns:
-        包含各API可用状态的字典
+        包含各API可用状态的只读字典
     """
-    return {
+    return MappingProxyType({
         "openai": bool(OPENAI_API_KEY),
         "reddit": bool(REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET),
         "producthunt": bool(PRODUCTHUNT_API_KEY)
-    }
+    })
 
 if __name__ == "__main__":
     # 如果直接运行此文件，则执行配置验证并打印结果
@@ -10,6 +10,7 @@ Email Digest Module
 
 import os
 import json
+import hashlib
 import httpx
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -17,23 +18,39 @@ from typing import Dict, Any, List, Optional
 # 导入项目模块
 from src.scoring import ScoringEngine
 from src.report import ReportBuilder
+from src.cache import SQLiteCache
+
+# 优先使用orjson直接编码/解析字节（跳过str中间步骤），未安装时退回标准库json
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+    _loads = json.loads
 
 # Buttondown API配置
 BUTTONDOWN_API_BASE = "https://api.buttondown.email/v1"
 BUTTONDOWN_API_KEY = os.getenv("BUTTONDOWN_API_KEY")
 
+# 开发时设置EMAIL_CACHE_DRAFTS=1：内容相同的草稿在有效期内不重复提交（正式发送不受影响）
+EMAIL_CACHE_DRAFTS = os.getenv("EMAIL_CACHE_DRAFTS") == "1"
+DRAFT_CACHE_TTL = 86400
+
 class EmailDigest:
     """
     邮件摘要模块
     使用Buttondown API发送每周市场机会摘要邮件
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
         """
         初始化邮件摘要模块
         
         Args:
             api_key: Buttondown API密钥，如果不提供则使用环境变量
+            client: 可选的httpx异步客户端，如果不提供则在首次发送时创建
         """
         self.api_key = api_key or BUTTONDOWN_API_KEY
         
@@ -44,6 +61,32 @@ class EmailDigest:
             "Authorization": f"Token {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # 多次发送复用同一个客户端（连接池），只关闭自己创建的客户端
+        self._client = client
+        self.owns_client = client is None
+        
+        # 报告生成器和评分引擎在首次生成邮件内容时创建，之后复用
+        self._report_builder: Optional[ReportBuilder] = None
+        self._scorer: Optional[ScoringEngine] = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """获取HTTP客户端，首次调用时创建"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(http2=True, timeout=30, headers=self.headers)
+        return self._client
+    
+    async def aclose(self):
+        """关闭自己创建的HTTP客户端"""
+        if self.owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def send_email(self, subject: str, body: str, email_type: str = "newsletter") -> Dict[str, Any]:
         """
@@ -59,16 +102,13 @@ class EmailDigest:
         """
         url = f"{BUTTONDOWN_API_BASE}/emails"
         
-        payload = {
-            "subject": subject,
-            "body": body,
-            "type": email_type
-        }
+        # 请求体结构固定，只编码三个字段值后拼接，不再构造字典再整体序列化
+        payload = b'{"subject":' + _dumps(subject) + b',"body":' + _dumps(body) + b',"type":' + _dumps(email_type) + b'}'
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+        client = await self._get_client()
+        response = await client.post(url, headers=self.headers, content=payload)
+        response.raise_for_status()
+        return _loads(response.content)
     
     def generate_email_content(self, posts: List[Dict[str, Any]]) -> Dict[str, str]:
         """
@@ -81,57 +121,63 @@ class EmailDigest:
             包含主题和正文的字典
         """
         # 使用ReportBuilder生成执行摘要
-        report_builder = ReportBuilder()
-        exec_summary = report_builder.generate_exec_summary(posts)
+        if self._report_builder is None:
+            self._report_builder = ReportBuilder()
+        exec_summary = self._report_builder.generate_exec_summary(posts)
         
         # 获取黄金区域帖子
-        scorer = ScoringEngine()
-        gold_zone_posts = scorer.get_gold_zone_posts(posts, limit=5)
+        if self._scorer is None:
+            self._scorer = ScoringEngine()
+        gold_zone_posts = self._scorer.get_gold_zone_posts(posts, limit=5)
         
         # 生成邮件主题
         today = datetime.now().strftime("%Y-%m-%d")
         subject = f"Market Demand Radar - 每周机会摘要 ({today})"
         
-        # 生成邮件正文
-        body = f"# 📊 Market Demand Radar - 每周机会摘要\n\n"
-        body += f"*生成时间: {today}*\n\n"
-        
-        # 添加执行摘要
-        body += "## 📈 本周摘要\n\n"
-        body += exec_summary + "\n\n"
-        
-        # 添加Top 5机会
-        body += "## 🥇 本周Top 5机会\n\n"
+        # 生成邮件正文（各段先放入列表，最后一次拼接）
+        parts = [
+            "# 📊 Market Demand Radar - 每周机会摘要\n\n",
+            f"*生成时间: {today}*\n\n",
+            # 添加执行摘要
+            "## 📈 本周摘要\n\n",
+            exec_summary + "\n\n",
+            # 添加Top 5机会
+            "## 🥇 本周Top 5机会\n\n"
+        ]
         
         if gold_zone_posts:
-            for i, post in enumerate(gold_zone_posts, 1):
-                opportunity = post.get("opportunity", {})
-                title = opportunity.get("title", post.get("title", "未知"))
+            opportunities = [post.get("opportunity") or {} for post in gold_zone_posts]
+            for i, (post, opportunity) in enumerate(zip(gold_zone_posts, opportunities), 1):
+                title = opportunity.get("title") or post.get("title", "未知")
                 pain_summary = opportunity.get("pain_summary", "")
                 
-                body += f"### {i}. {title}\n\n"
-                body += f"- **机会分数**: {post.get('opportunity_score', 0)}\n"
+                parts.extend([
+                    f"### {i}. {title}\n\n",
+                    f"- **机会分数**: {post.get('opportunity_score', 0)}\n"
+                ])
                 
                 if pain_summary:
-                    body += f"- **痛点摘要**: {pain_summary}\n"
+                    parts.append(f"- **痛点摘要**: {pain_summary}\n")
                 
                 # 添加标签
-                tags = opportunity.get("tags", [])
+                tags = opportunity.get("tags")
                 if tags:
-                    body += "- **标签**: " + ", ".join([f"#{tag}" for tag in tags]) + "\n"
+                    parts.append(f"- **标签**: {', '.join(f'#{tag}' for tag in tags)}\n")
                 
-                body += "\n"
+                parts.append("\n")
         else:
-            body += "*本周未发现黄金区域机会*\n\n"
+            parts.append("*本周未发现黄金区域机会*\n\n")
         
-        # 添加CTA按钮
-        body += "## 🚀 开始行动\n\n"
-        body += "发现感兴趣的机会？点击下方按钮开始构建！\n\n"
-        body += "[开始构建](https://example.com/start-building)\n\n"
-        
-        # 添加页脚
-        body += "---\n\n"
-        body += "*此邮件由Market Demand Radar自动生成。如需退订，请点击邮件底部的退订链接。*\n"
+        parts.extend([
+            # 添加CTA按钮
+            "## 🚀 开始行动\n\n",
+            "发现感兴趣的机会？点击下方按钮开始构建！\n\n",
+            "[开始构建](https://example.com/start-building)\n\n",
+            # 添加页脚
+            "---\n\n",
+            "*此邮件由Market Demand Radar自动生成。如需退订，请点击邮件底部的退订链接。*\n"
+        ])
+        body = "".join(parts)
         
         return {
             "subject": subject,
@@ -152,6 +198,10 @@ class EmailDigest:
         # 生成邮件内容
         email_content = self.generate_email_content(posts)
         
+        # 开发时相同内容的草稿直接返回上次的API响应
+        if send_as_draft and EMAIL_CACHE_DRAFTS:
+            return await self._send_cached_draft(email_content["subject"], email_content["body"])
+        
         # 发送邮件
         email_type = "draft" if send_as_draft else "newsletter"
         response = await self.send_email(
@@ -161,6 +211,20 @@ class EmailDigest:
         )
         
         return response
+    
+    async def _send_cached_draft(self, subject: str, body: str) -> Dict[str, Any]:
+        """发送草稿，按主题和正文的哈希缓存API响应，有效期内内容不变时不再请求"""
+        digest = hashlib.sha256(f"{subject}\0{body}".encode("utf-8")).hexdigest()
+        key = f"email_draft:{digest}"
+        cache = SQLiteCache()
+        try:
+            response = await cache.aget(key)
+            if response is None:
+                response = await self.send_email(subject=subject, body=body, email_type="draft")
+                await cache.aset(key, response, DRAFT_CACHE_TTL)
+            return response
+        finally:
+            cache.close()
 
 # 使用示例
 async def main():
@@ -209,18 +273,17 @@ async def main():
     # 初始化EmailDigest
     # 注意：需要设置BUTTONDOWN_API_KEY环境变量
     try:
-        digest = EmailDigest()
-        
-        # 生成邮件内容但不发送
-        email_content = digest.generate_email_content(test_posts)
-        print(f"邮件主题: {email_content['subject']}")
-        print(f"邮件正文预览:\n{email_content['body'][:200]}...")
-        
-        # 如果设置了API密钥，可以尝试发送草稿
-        if BUTTONDOWN_API_KEY:
-            print("尝试发送草稿...")
-            response = await digest.send_weekly_digest(test_posts, send_as_draft=True)
-            print(f"API响应: {response}")
+        async with EmailDigest() as digest:
+            # 生成邮件内容但不发送
+            email_content = digest.generate_email_content(test_posts)
+            print(f"邮件主题: {email_content['subject']}")
+            print(f"邮件正文预览:\n{email_content['body'][:200]}...")
+            
+            # 如果设置了API密钥，可以尝试发送草稿
+            if BUTTONDOWN_API_KEY:
+                print("尝试发送草稿...")
+                response = await digest.send_weekly_digest(test_posts, send_as_draft=True)
+                print(f"API响应: {response}")
     except Exception as e:
         print(f"发送邮件摘要时出错: {str(e)}")
 
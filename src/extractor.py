@@ -9,26 +9,76 @@ LLM Extractor Module
 """
 
 import json
+import mmap
 import os
 import asyncio
-from typing import Dict, Any, List, Optional
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
 import openai
 from datetime import datetime
 
+from src.cache import SQLiteCache
+
+# 优先使用orjson解析LLM返回的JSON（更快），未安装时退回标准库json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # 加载OpenAI API密钥
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise ValueError("❌ OPENAI_API_KEY is not set. Please export it in your shell.")
 
-# 设置OpenAI客户端
-openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
-
 # 备用模型，当主模型失败时使用
 PRIMARY_MODEL = "gpt-3.5-turbo"
 FALLBACK_MODEL = "gpt-3.5-turbo-instruct"
 
-# 批处理大小
-BATCH_SIZE = 10
+# 同时进行的OpenAI请求数上限（取代原先固定大小的分批处理）
+MAX_CONCURRENT_REQUESTS = 16
+
+# 429等可重试错误的最大重试次数（由SDK按指数回退并遵循Retry-After重试）
+MAX_RETRIES = 5
+
+# 提取结果缓存有效期（14天），同一帖子在每日扫描中重复出现时不再调用API
+EXTRACTION_CACHE_TTL = 14 * 86400
+
+# 用于从混有说明文字的LLM响应中解析第一个JSON对象
+_json_decoder = json.JSONDecoder()
+
+# 提示词模板中的占位符
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{(post_text|source|url)\}\}")
+
+def create_openai_client() -> openai.AsyncOpenAI:
+    """创建异步OpenAI客户端，底层使用带连接池的httpx客户端复用到API的长连接"""
+    return openai.AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        max_retries=MAX_RETRIES,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS),
+            timeout=60.0
+        )
+    )
+
+@lru_cache(maxsize=8)
+def _load_prompt(path: str) -> str:
+    """读取提示词模板文件（按路径缓存，多个提取器实例只读取一次）"""
+    with open(path, "rb") as f:
+        # 空文件无法内存映射
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # 内存映射后直接从页缓存解码，不经过文件对象的读缓冲
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return content[:].decode("utf-8")
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> openai.AsyncOpenAI:
+    """获取进程内共享的异步OpenAI客户端，所有提取器（包括备用模型）共用一个连接池"""
+    return create_openai_client()
 
 class LLMExtractor:
     """
@@ -36,26 +86,49 @@ class LLMExtractor:
     使用OpenAI GPT模型分析帖子并提取结构化的产品机会信息
     """
     
-    def __init__(self, model: str = PRIMARY_MODEL, prompt_path: str = None):
+    def __init__(self, model: str = PRIMARY_MODEL, prompt_path: str = None, client: Optional[openai.AsyncOpenAI] = None):
         """
         初始化LLM提取器
         
         Args:
             model: 使用的OpenAI模型名称
             prompt_path: 提示词文件路径，如果不提供则使用默认路径
+            client: 可选的异步OpenAI客户端，如果不提供则使用共享客户端
         """
         self.model = model
-        self.client = openai_client
+        self.client = client or get_openai_client()
         
         # 加载提示词模板
         if prompt_path is None:
             prompt_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
                                       "prompts", "opportunity_v2.txt")
         
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            self.prompt_template = f.read()
+        self.prompt_template = _load_prompt(prompt_path)
+        # 预先按占位符切分模板：偶数位置是静态文本，奇数位置是占位符名
+        self._prompt_segments = _PLACEHOLDER_PATTERN.split(self.prompt_template)
+        
+        # 提取结果缓存：进程内字典 + SQLite持久缓存
+        self.cache = SQLiteCache()
+        self._memory_cache: Dict[str, Dict[str, Any]] = {}
+        # 模型名和提示词内容参与缓存键，修改提示词后旧结果自动失效
+        self._cache_namespace = f"{self.model}|{hashlib.sha256(self.prompt_template.encode('utf-8')).hexdigest()[:16]}"
+        # 限制同时进行的API请求数以避免限流
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    def _cache_key(self, post_id: str, post_text: str) -> str:
+        """根据模型、提示词版本、帖子ID和规范化文本生成缓存键"""
+        normalized = " ".join(post_text.split()).lower()
+        digest = hashlib.sha256(f"{self._cache_namespace}|{post_id}|{normalized}".encode("utf-8")).hexdigest()
+        return f"llm:{digest}"
     
-    async def extract_opportunity(self, post_text: str, source: str, url: str) -> Dict[str, Any]:
+    def _render_prompt(self, values: Dict[str, str]) -> str:
+        """用预切分的模板片段拼接提示词"""
+        return "".join(
+            values[segment] if i % 2 else segment
+            for i, segment in enumerate(self._prompt_segments)
+        )
+    
+    async def extract_opportunity(self, post_text: str, source: str, url: str, model: Optional[str] = None) -> Dict[str, Any]:
         """
         从帖子中提取产品机会信息
         
@@ -63,19 +136,28 @@ class LLMExtractor:
             post_text: 帖子文本内容
             source: 来源平台（如Reddit, Product Hunt等）
             url: 帖子URL
+            model: 本次调用使用的模型，如果不提供则使用实例的模型
             
         Returns:
             结构化的产品机会信息，包含更丰富的用户需求洞察
         """
-        # 填充提示词模板
-        prompt = self.prompt_template.replace("{{post_text}}", post_text)
-        prompt = prompt.replace("{{source}}", source)
-        prompt = prompt.replace("{{url}}", url)
+        opportunity, _ = await self._extract_with_model(post_text, source, url, model or self.model)
+        return opportunity
+    
+    async def _extract_with_model(self, post_text: str, source: str, url: str, model: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        调用指定模型提取产品机会信息，主模型失败时改用备用模型
+        
+        Returns:
+            (提取结果, 实际产生结果的模型)，提取失败时模型为None
+        """
+        # 填充提示词模板（一次拼接，不逐个替换占位符）
+        prompt = self._render_prompt({"post_text": post_text, "source": source, "url": url})
         
         try:
-            # 调用OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # 调用OpenAI API（异步，不阻塞事件循环）
+            response = await self.client.chat.completions.create(
+                model=model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.4
             )
@@ -84,26 +166,23 @@ class LLMExtractor:
             
             # 解析JSON结果
             try:
-                opportunity = json.loads(result)
-                return opportunity
-            except json.JSONDecodeError:
-                # 如果返回的不是有效JSON，尝试提取JSON部分
+                return _loads(result), model
+            except ValueError:
+                # 如果返回的不是有效JSON，从第一个"{"开始解析出一个完整的JSON对象（忽略前后的说明文字）
                 json_start = result.find("{")
-                json_end = result.rfind("}")
-                if json_start != -1 and json_end != -1:
-                    json_str = result[json_start:json_end+1]
-                    return json.loads(json_str)
+                if json_start != -1:
+                    opportunity, _ = _json_decoder.raw_decode(result, json_start)
+                    return opportunity, model
                 else:
                     raise ValueError("无法从LLM响应中提取有效JSON")
                 
         except Exception as e:
-            print(f"⚠️ 使用{self.model}提取机会时出错: {str(e)}")
+            print(f"⚠️ 使用{model}提取机会时出错: {str(e)}")
             
-            # 如果使用主模型失败，尝试使用备用模型
-            if self.model == PRIMARY_MODEL:
+            # 如果使用主模型失败，用同一实例（共享客户端和缓存）改用备用模型重试
+            if model == PRIMARY_MODEL:
                 print(f"尝试使用备用模型{FALLBACK_MODEL}...")
-                backup_extractor = LLMExtractor(model=FALLBACK_MODEL)
-                return await backup_extractor.extract_opportunity(post_text, source, url)
+                return await self._extract_with_model(post_text, source, url, FALLBACK_MODEL)
             else:
                 # 返回空结果
                 return {
@@ -113,7 +192,58 @@ class LLMExtractor:
                     "solo_doable": False,
                     "monetizable": False,
                     "tags": ["extraction_failed"]
-                }
+                }, None
+    
+    async def extract_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        处理单个帖子并提取产品机会信息（并发请求数受实例信号量限制）
+        
+        Args:
+            post: 帖子数据，应包含title, content, source, url字段
+            
+        Returns:
+            添加了opportunity字段的帖子
+        """
+        try:
+            opportunity = await self._extract_cached(post)
+        except Exception as e:
+            print(f"处理帖子时出错: {str(e)}")
+            opportunity = {
+                "title": "处理错误",
+                "pain_summary": f"处理帖子时出错: {str(e)}",
+                "unmet_need": False,
+                "solo_doable": False,
+                "monetizable": False,
+                "tags": ["processing_error"]
+            }
+        post["opportunity"] = opportunity
+        return post
+    
+    async def _extract_cached(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """先查缓存，未命中时调用API并缓存成功的提取结果"""
+        # 组合标题和内容作为分析文本
+        post_text = post.get("title", "")
+        if post.get("content"):
+            post_text += "\n" + post["content"]
+        
+        source = post.get("source", "unknown")
+        url = post.get("url", "")
+        
+        # 先查缓存，命中时跳过API调用
+        key = self._cache_key(str(post.get("id", "")), post_text)
+        cached = self._memory_cache.get(key) or await self.cache.aget(key)
+        if cached is not None:
+            self._memory_cache[key] = cached
+            return cached
+        
+        async with self._semaphore:
+            opportunity, produced_by = await self._extract_with_model(post_text, source, url, self.model)
+        
+        # 只缓存本实例模型成功提取的结果；备用模型的结果不写入以主模型为键的缓存，下次运行仍会先尝试主模型
+        if produced_by == self.model and isinstance(opportunity, dict):
+            self._memory_cache[key] = opportunity
+            await self.cache.aset(key, opportunity, EXTRACTION_CACHE_TTL)
+        return opportunity
     
     async def batch_extract(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -125,47 +255,8 @@ class LLMExtractor:
         Returns:
             带有提取结果的帖子列表
         """
-        results = []
-        
-        # 分批处理以避免API限制
-        for i in range(0, len(posts), BATCH_SIZE):
-            batch = posts[i:i+BATCH_SIZE]
-            tasks = []
-            
-            for post in batch:
-                # 组合标题和内容作为分析文本
-                post_text = post.get("title", "")
-                if post.get("content"):
-                    post_text += "\n" + post["content"]
-                
-                source = post.get("source", "unknown")
-                url = post.get("url", "")
-                
-                # 创建异步任务
-                task = asyncio.create_task(
-                    self.extract_opportunity(post_text, source, url)
-                )
-                tasks.append((post, task))
-            
-            # 等待所有任务完成
-            for post, task in tasks:
-                try:
-                    opportunity = await task
-                    post["opportunity"] = opportunity
-                    results.append(post)
-                except Exception as e:
-                    print(f"处理帖子时出错: {str(e)}")
-                    post["opportunity"] = {
-                        "title": "处理错误",
-                        "pain_summary": f"处理帖子时出错: {str(e)}",
-                        "unmet_need": False,
-                        "solo_doable": False,
-                        "monetizable": False,
-                        "tags": ["processing_error"]
-                    }
-                    results.append(post)
-        
-        return results
+        # 所有帖子并发请求，信号量限制同时进行的请求数以避免API限流
+        return list(await asyncio.gather(*(self.extract_post(post) for post in posts)))
 
 # 使用示例
 async def main():
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Keyword Matching Module
+
+多关键词匹配工具：优先使用Aho-Corasick自动机一次扫描文本，
+未安装pyahocorasick时退回单个预编译正则
+"""
+
+import re
+from typing import Callable, Dict, FrozenSet, Iterable
+
+def build_keyword_matcher(keywords: Iterable[str]) -> Callable[[str], bool]:
+    """
+    构建关键词匹配函数（忽略大小写的子串匹配）
+    
+    Args:
+        keywords: 关键词列表
+        
+    Returns:
+        接收文本、返回是否包含任一关键词的函数
+    """
+    words = [kw.lower() for kw in keywords if kw]
+    if not words:
+        return lambda text: False
+    try:
+        import ahocorasick
+    except ImportError:
+        pattern = re.compile("|".join(map(re.escape, words)))
+        return lambda text: pattern.search(text.lower()) is not None
+    
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text.lower()), None) is not None
+
+def build_keyword_classifier(groups: Dict[str, Iterable[str]]) -> Callable[[str], FrozenSet[str]]:
+    """
+    构建多组关键词分类函数（忽略大小写的子串匹配），一次扫描得到命中的所有分组
+    
+    Args:
+        groups: 分组名到关键词列表的映射
+        
+    Returns:
+        接收文本、返回命中关键词的分组名集合的函数
+    """
+    words = {name: [kw.lower() for kw in keywords if kw] for name, keywords in groups.items()}
+    try:
+        import ahocorasick
+    except ImportError:
+        patterns = [
+            (name, re.compile("|".join(map(re.escape, group_words))))
+            for name, group_words in words.items() if group_words
+        ]
+        def classify(text: str) -> FrozenSet[str]:
+            lowered = text.lower()
+            return frozenset(name for name, pattern in patterns if pattern.search(lowered))
+        return classify
+    
+    # 同一关键词可能属于多个分组，自动机的值保存所有分组
+    word_groups: Dict[str, set] = {}
+    for name, group_words in words.items():
+        for word in group_words:
+            word_groups.setdefault(word, set()).add(name)
+    if not word_groups:
+        return lambda text: frozenset()
+    
+    automaton = ahocorasick.Automaton()
+    for word, names in word_groups.items():
+        automaton.add_word(word, frozenset(names))
+    automaton.make_automaton()
+    
+    def classify(text: str) -> FrozenSet[str]:
+        hits = set()
+        for _, names in automaton.iter(text.lower()):
+            hits |= names
+            if len(hits) == len(words):
+                break
+        return frozenset(hits)
+    return classify
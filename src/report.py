@@ -9,13 +9,432 @@ Report Builder Module
 """
 
 import os
+import hashlib
+import heapq
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import pandas as pd
 import numpy as np
 from pandas.io.formats.style import Styler
 
+from src.keywords import build_keyword_classifier
+
+# 附录评分分布的区间边界：[0, 30), [30, 50), [50, 70), [70, 100)
+SCORE_RANGE_EDGES = (0, 30, 50, 70, 100)
+
+# 标题关键词对应的产品类别，按顺序取第一个匹配的类别，都不匹配时为default
+TITLE_CATEGORIES = (
+    ("schedule", ("日程", "规划")),
+    ("learning", ("学习", "教育")),
+    ("team", ("团队", "协作")),
+    ("finance", ("财务", "金融")),
+    ("health", ("健康", "饮食")),
+    ("writing", ("写作", "创意")),
+    ("meditation", ("冥想", "正念")),
+    ("dev", ("项目管理", "开发者")),
+    ("focus", ("极简", "专注")),
+    ("skill", ("技能", "交换"))
+)
+
+# 洞察分析使用的产品类别（按顺序匹配）及对应的标签，标题关键词与TITLE_CATEGORIES相同
+INSIGHT_CATEGORY_TAGS = (
+    ("schedule", ("calendar", "planning")),
+    ("learning", ("learning", "education")),
+    ("team", ("team", "collaboration")),
+    ("finance", ("finance", "money")),
+    ("health", ("health", "nutrition")),
+    ("writing", ("writing", "creative")),
+    ("focus", ("minimalism", "focus"))
+)
+
+# 洞察分析中各产品类别的通用痛点、痒点和爽点
+INSIGHT_TEMPLATES = {
+    "schedule": {
+        "pain_points": (
+            "现有日历应用无法智能调整任务优先级",
+            "在多个日历应用间切换造成信息碎片化",
+            "手动调整日程耗时且容易出错"
+        ),
+        "itch_points": (
+            "希望有更美观的日历界面",
+            "希望能自定义更多视图选项",
+            "希望有更丰富的提醒方式"
+        ),
+        "delight_points": (
+            "AI自动规划最优日程安排",
+            "智能识别并解决日程冲突",
+            "根据历史完成情况优化未来规划"
+        )
+    },
+    "learning": {
+        "pain_points": (
+            "学习进度难以持续跟踪",
+            "缺乏针对个人水平的学习路径",
+            "学习材料质量参差不齐"
+        ),
+        "itch_points": (
+            "希望有更多互动练习",
+            "希望能与其他学习者交流",
+            "希望有更多趣味性内容"
+        ),
+        "delight_points": (
+            "AI生成个性化学习计划",
+            "实时语言对话练习",
+            "沉浸式学习体验"
+        )
+    },
+    "team": {
+        "pain_points": (
+            "团队沟通效率低下",
+            "项目进度难以实时追踪",
+            "远程协作缺乏面对面交流的效果"
+        ),
+        "itch_points": (
+            "希望有更直观的项目视图",
+            "希望能更方便地分享和查找文件",
+            "希望有更灵活的权限设置"
+        ),
+        "delight_points": (
+            "智能任务分配和负载均衡",
+            "实时协作编辑与即时反馈",
+            "自动生成会议纪要和行动项"
+        )
+    },
+    "finance": {
+        "pain_points": (
+            "手动记账费时且容易遗漏",
+            "难以全面了解个人财务状况",
+            "缺乏有效的预算规划工具"
+        ),
+        "itch_points": (
+            "希望有更美观的财务报表",
+            "希望能自动同步多个账户",
+            "希望有更多财务建议"
+        ),
+        "delight_points": (
+            "AI预测未来财务状况",
+            "智能识别节省机会",
+            "个性化投资建议"
+        )
+    },
+    "health": {
+        "pain_points": (
+            "难以坚持健康饮食计划",
+            "营养信息复杂难以理解",
+            "缺乏个性化的健康建议"
+        ),
+        "itch_points": (
+            "希望有更多健康食谱推荐",
+            "希望能追踪更多健康指标",
+            "希望有更美观的进度展示"
+        ),
+        "delight_points": (
+            "扫描食物自动识别营养成分",
+            "根据个人情况智能调整饮食计划",
+            "社区支持和激励系统"
+        )
+    },
+    "writing": {
+        "pain_points": (
+            "创作灵感枯竭",
+            "写作过程中容易分心",
+            "缺乏有效的写作结构工具"
+        ),
+        "itch_points": (
+            "希望有更多写作模板",
+            "希望能追踪写作进度",
+            "希望有更好的版本管理"
+        ),
+        "delight_points": (
+            "AI生成创意灵感和建议",
+            "智能分析写作风格和结构",
+            "沉浸式写作环境"
+        )
+    },
+    "focus": {
+        "pain_points": (
+            "数字干扰严重影响工作效率",
+            "难以长时间保持专注",
+            "缺乏有效的时间管理方法"
+        ),
+        "itch_points": (
+            "希望有更简洁的界面设计",
+            "希望能自定义专注时长",
+            "希望有更多专注技巧指导"
+        ),
+        "delight_points": (
+            "智能识别并屏蔽干扰源",
+            "根据个人专注曲线优化工作时间",
+            "成就系统增强坚持动力"
+        )
+    },
+    "default": {
+        "pain_points": (
+            "现有解决方案使用复杂",
+            "功能与用户需求不匹配",
+            "价格与价值不成正比"
+        ),
+        "itch_points": (
+            "希望有更好的用户界面",
+            "希望有更多自定义选项",
+            "希望有更好的客户支持"
+        ),
+        "delight_points": (
+            "超出预期的易用性",
+            "创新功能带来惊喜体验",
+            "无缝集成到现有工作流程"
+        )
+    }
+}
+
+# 评论关键词分类，用于智能提取洞察（痛点、痒点、爽点）
+INSIGHT_KEYWORDS = {
+    "pain": ["frustrated", "annoying", "hate", "difficult", "problem", "issue", "struggle", "pain", "terrible",
+             "烦人", "讨厌", "困难", "问题", "挣扎", "痛苦", "糟糕", "浪费时间", "不方便", "麻烦"],
+    "itch": ["wish", "would be nice", "hope", "could be better", "improve", "missing", "lack",
+             "希望", "改进", "提升", "缺少", "缺乏", "不够好", "可以更好", "更好的体验"],
+    "delight": ["love", "amazing", "perfect", "awesome", "great", "excellent", "game changer", "revolutionary",
+                "喜欢", "惊人", "完美", "棒极了", "太好了", "出色", "改变游戏规则", "革命性"]
+}
+_match_insight_keywords = build_keyword_classifier(INSIGHT_KEYWORDS)
+
+@lru_cache(maxsize=1024)
+def _title_categories(title: str) -> Tuple[str, ...]:
+    """标题命中的所有产品类别（按TITLE_CATEGORIES顺序），同一标题在各部分之间只扫描一次"""
+    return tuple(category for category, keywords in TITLE_CATEGORIES if any(keyword in title for keyword in keywords))
+
+# 黄金区域各产品类别的分析模板（痛点深度分析和用户反馈只有部分类别有专门内容，其余使用default）
+GOLD_ZONE_TEMPLATES = {
+    "schedule": {
+        "pain_analysis": (
+            "  - *影响*: 导致任务优先级混乱，重要工作被延误\n"
+            "  - *根本原因*: 现有工具缺乏智能分析能力，无法适应动态变化\n"
+            "  - *市场缺口*: 智能化日程规划与自动优先级调整\n"
+        ),
+        "user_feedback": (
+            "- *\"我尝试过十几个日程应用,没有一个能真正解决我的问题...\"*\n"
+            "- *\"最大的问题是它们都不够智能,无法适应我不断变化的优先级...\"*\n"
+        ),
+        "features": (
+            "1. **智能日程自动规划** - 根据任务优先级和时间限制自动安排最优日程\n"
+            "2. **灵活调整与冲突解决** - 当新任务加入时智能重新安排，避免日程冲突\n"
+            "3. **多平台同步与提醒** - 跨设备同步日程并提供智能提醒\n"
+        ),
+        "scenarios": (
+            "- **工作规划**: 专业人士安排复杂工作日程，平衡多项任务优先级\n"
+            "- **学习计划**: 学生规划考试准备和作业完成时间\n"
+            "- **团队协调**: 项目团队协调会议和截止日期\n"
+        ),
+        "customers": (
+            "- **商务专业人士**: 需要高效管理时间的企业经理和高管\n"
+            "- **自由职业者**: 管理多个项目和客户的独立工作者\n"
+            "- **学生**: 平衡学业、社交和兼职工作的大学生\n"
+        ),
+        "killer_feature": "**智能优先级调整** - 区别于传统日历的关键创新是能根据任务重要性、紧急程度和用户过往行为自动调整日程优先级，解决用户在任务冲突时的决策困难，真正实现智能化时间管理而非简单的日程记录。\n"
+    },
+    "learning": {
+        "pain_analysis": (
+            "  - *影响*: 学习效率低下，难以持续保持动力\n"
+            "  - *根本原因*: 标准化学习路径无法满足个性化需求\n"
+            "  - *市场缺口*: 基于AI的个性化学习路径规划\n"
+        ),
+        "user_feedback": (
+            "- *\"学习新语言最大的挑战是坚持下去,需要更好的激励机制...\"*\n"
+            "- *\"希望有一个平台能整合所有我需要的语言学习资源...\"*\n"
+        ),
+        "features": (
+            "1. **个性化学习路径** - 根据学习者水平和目标定制学习计划\n"
+            "2. **互动练习与即时反馈** - 提供沉浸式学习体验和实时纠错\n"
+            "3. **社区学习与激励机制** - 建立学习社区增强动力和坚持度\n"
+        ),
+        "scenarios": (
+            "- **自学进修**: 成人学习者利用碎片时间学习新语言\n"
+            "- **学校补充**: 学生使用平台巩固课堂知识\n"
+            "- **职业发展**: 专业人士学习新技能提升职场竞争力\n"
+        ),
+        "customers": (
+            "- **语言学习者**: 希望掌握多种语言的国际化人才\n"
+            "- **职场人士**: 寻求技能提升的在职人员\n"
+            "- **终身学习者**: 对持续学习有热情的各年龄段人群\n"
+        ),
+        "killer_feature": "**跨语言学习生态系统** - 突破传统单一语言学习应用限制，创建统一平台整合多语言学习资源、进度和社区，让用户无需在不同应用间切换即可管理多语言学习，显著提升学习效率和持续性。\n"
+    },
+    "team": {
+        "pain_analysis": (
+            "  - *影响*: 沟通成本高，项目延期风险增加\n"
+            "  - *根本原因*: 工具碎片化，信息孤岛问题严重\n"
+            "  - *市场缺口*: 一体化协作平台与智能项目管理\n"
+        ),
+        "user_feedback": (
+            "- *\"远程工作最大的痛点是无法像办公室那样即时沟通和协作...\"*\n"
+            "- *\"我们团队使用了太多工具,信息散落各处,难以追踪...\"*\n"
+        ),
+        "features": (
+            "1. **实时协作文档编辑** - 支持多人同时编辑和查看变更历史\n"
+            "2. **任务分配与进度追踪** - 清晰的任务责任制和完成状态可视化\n"
+            "3. **集成通讯与文件共享** - 一站式沟通和资源共享平台\n"
+        ),
+        "scenarios": (
+            "- **远程工作**: 分布式团队保持项目同步和沟通\n"
+            "- **跨部门协作**: 不同部门协同完成复杂项目\n"
+            "- **客户合作**: 与外部客户共享进度和收集反馈\n"
+        ),
+        "customers": (
+            "- **远程团队**: 分布在不同地点的工作团队\n"
+            "- **项目经理**: 负责协调团队和资源的管理者\n"
+            "- **初创公司**: 需要高效协作但预算有限的小团队\n"
+        ),
+        "killer_feature": "**情境感知协作空间** - 超越简单的文件共享和消息传递，系统能根据项目阶段、团队角色和工作模式自动调整界面和工具集，为不同协作场景提供最优工作流程，解决远程团队缺乏情境感知的核心痛点。\n"
+    },
+    "finance": {
+        "features": (
+            "1. **自动化收支追踪** - 智能分类和标记交易记录\n"
+            "2. **预算规划与提醒** - 个性化预算建议和超支预警\n"
+            "3. **财务目标设定与可视化** - 直观展示储蓄和投资进度\n"
+        ),
+        "scenarios": (
+            "- **日常预算**: 个人追踪日常支出和管理预算\n"
+            "- **储蓄计划**: 设定财务目标并追踪储蓄进度\n"
+            "- **投资管理**: 监控投资组合和回报率\n"
+        ),
+        "customers": (
+            "- **年轻专业人士**: 开始建立财务习惯的职场新人\n"
+            "- **家庭财务管理者**: 管理家庭预算的个人\n"
+            "- **理财初学者**: 希望改善财务状况但缺乏专业知识的人\n"
+        ),
+        "killer_feature": "**行为洞察与财务教练** - 不只是记录支出，而是分析消费行为模式并提供个性化改进建议，像私人财务教练一样引导用户形成更健康的财务习惯，解决用户知道问题但难以改变行为的关键痛点。\n"
+    },
+    "health": {
+        "features": (
+            "1. **个性化营养建议** - 基于个人健康状况和目标的饮食推荐\n"
+            "2. **食物数据库与扫描识别** - 庞大的食品营养数据库和便捷的条码扫描\n"
+            "3. **进度追踪与成就系统** - 可视化健康改善进度和激励机制\n"
+        ),
+        "scenarios": (
+            "- **减重计划**: 控制卡路里摄入和追踪体重变化\n"
+            "- **特殊饮食**: 管理食物过敏或特定饮食需求\n"
+            "- **健康改善**: 逐步调整饮食习惯提升整体健康\n"
+        ),
+        "customers": (
+            "- **健康意识人群**: 注重营养和健康饮食的个人\n"
+            "- **特殊饮食需求者**: 有食物过敏或饮食限制的人\n"
+            "- **健身爱好者**: 将饮食作为健身计划一部分的人\n"
+        ),
+        "killer_feature": "**情境化营养建议** - 突破简单卡路里计数，根据用户当前健康状况、活动水平、饮食历史和可用食物选择提供实时、可行的营养建议，解决用户知道应该吃什么但难以在实际情况中做出健康选择的核心痛点。\n"
+    },
+    "writing": {
+        "features": (
+            "1. **智能写作建议与灵感生成** - AI辅助提供创意和改进建议\n"
+            "2. **结构化写作工具** - 大纲规划和章节组织功能\n"
+            "3. **专注模式与目标设定** - 减少干扰的写作环境和进度追踪\n"
+        ),
+        "scenarios": (
+            "- **内容创作**: 博客作者和内容创作者撰写文章\n"
+            "- **学术写作**: 研究人员和学生撰写论文\n"
+            "- **创意写作**: 小说家和剧作家发展故事和角色\n"
+        ),
+        "customers": (
+            "- **内容创作者**: 博客作者、自媒体和内容营销人员\n"
+            "- **作家和剧作家**: 创作小说、剧本的专业或业余创作者\n"
+            "- **学生和学者**: 需要撰写论文和研究报告的人\n"
+        ),
+        "killer_feature": "**创意瓶颈突破系统** - 通过分析用户写作风格和当前内容，在创作停滞时提供个性化的创意提示和结构建议，解决写作者面对空白页时的创意阻塞，显著提高创作流畅度和完成率。\n"
+    },
+    "meditation": {
+        "features": (
+            "1. **个性化冥想指导** - 根据用户需求和经验提供定制内容\n"
+            "2. **进度追踪与习惯养成** - 记录冥想历程和坚持度\n"
+            "3. **情绪管理工具** - 提供针对特定情绪状态的冥想练习\n"
+        ),
+        "scenarios": (
+            "- **压力管理**: 在高压工作环境中寻找平静\n"
+            "- **睡眠改善**: 睡前放松提高睡眠质量\n"
+            "- **情绪调节**: 应对焦虑和负面情绪\n"
+        ),
+        "customers": (
+            "- **高压职业人士**: 寻求压力缓解的企业员工\n"
+            "- **冥想初学者**: 希望开始冥想习惯但需要指导的人\n"
+            "- **健康生活追求者**: 将冥想作为整体健康计划一部分的人\n"
+        ),
+        "killer_feature": "**生物反馈引导冥想** - 结合可穿戴设备数据实时调整冥想引导内容，根据用户当前生理状态(心率、呼吸等)提供个性化指导，解决传统冥想应用无法感知用户实际状态的局限，大幅提高冥想效果。\n"
+    },
+    "dev": {
+        "features": (
+            "1. **轻量级任务跟踪** - 简洁直观的任务管理系统\n"
+            "2. **时间追踪与估算** - 记录工作时间并优化未来估算\n"
+            "3. **集成开发工具** - 与常用开发环境和版本控制系统无缝集成\n"
+        ),
+        "scenarios": (
+            "- **独立开发**: 自由开发者管理个人项目\n"
+            "- **小型团队**: 初创公司协调开发工作\n"
+            "- **客户项目**: 自由职业者管理多个客户项目\n"
+        ),
+        "customers": (
+            "- **独立开发者**: 管理个人项目的软件工程师\n"
+            "- **自由职业技术人员**: 同时处理多个客户项目的自由工作者\n"
+            "- **小型开发团队**: 资源有限的创业公司技术团队\n"
+        ),
+        "killer_feature": "**开发者思维流追踪** - 专为独立开发者设计的系统能捕捉开发过程中的思考流程和决策点，自动生成开发日志和文档，解决开发者在创意实现过程中的上下文切换和知识管理痛点，显著提高开发效率。\n"
+    },
+    "focus": {
+        "features": (
+            "1. **数字使用监控与限制** - 追踪屏幕时间并设置使用限制\n"
+            "2. **干扰源识别与屏蔽** - 识别并减少注意力分散因素\n"
+            "3. **专注时段与奖励机制** - 设定不受干扰的工作时段和完成奖励\n"
+        ),
+        "scenarios": (
+            "- **深度工作**: 创建无干扰的工作环境\n"
+            "- **数字排毒**: 减少社交媒体和数字设备依赖\n"
+            "- **注意力训练**: 提高专注能力和工作效率\n"
+        ),
+        "customers": (
+            "- **知识工作者**: 需要长时间专注的专业人士\n"
+            "- **数字疲劳人群**: 感到数字过载和注意力分散的用户\n"
+            "- **效率追求者**: 希望优化工作流程和减少干扰的人\n"
+        ),
+        "killer_feature": "**注意力恢复算法** - 基于认知科学研究，系统能识别用户注意力模式并在最佳时机提供微休息和注意力恢复活动，解决数字世界中持续注意力消耗导致的效率下降问题，帮助用户维持长期高效工作状态。\n"
+    },
+    "skill": {
+        "features": (
+            "1. **技能匹配算法** - 智能匹配互补技能的用户\n"
+            "2. **信誉评级系统** - 建立用户信任机制确保交换质量\n"
+            "3. **安全交流渠道** - 提供安全可靠的沟通和协作方式\n"
+        ),
+        "scenarios": (
+            "- **社区互助**: 邻里间交换技能和服务\n"
+            "- **专业发展**: 专业人士交换知识和指导\n"
+            "- **创意合作**: 艺术家和创作者合作项目\n"
+        ),
+        "customers": (
+            "- **社区成员**: 希望加强社区联系的居民\n"
+            "- **技能学习者**: 希望通过实践学习新技能的人\n"
+            "- **资源有限人群**: 希望通过交换获取服务而非支付现金的人\n"
+        ),
+        "killer_feature": "**价值均衡交换系统** - 创新的技能价值评估算法能客观量化不同技能的价值，确保交换公平性，解决传统技能交换平台中价值评估不明确导致的信任问题，显著提高用户参与度和交换成功率。\n"
+    },
+    "default": {
+        "pain_analysis": (
+            "  - *影响*: 降低用户体验，增加使用门槛\n"
+            "  - *根本原因*: 现有解决方案未充分理解用户核心需求\n"
+            "  - *市场缺口*: 以用户为中心的创新解决方案\n"
+        ),
+        "user_feedback": (
+            "- *\"现有解决方案缺乏创新,大多是相同功能的不同包装...\"*\n"
+            "- *\"用户体验应该是首要考虑因素,但很多产品忽视了这点...\"*\n"
+        ),
+        "features": (
+            "1. **核心功能待定** - 需要进一步市场调研确定\n"
+            "2. **用户体验优化** - 简洁直观的界面设计\n"
+            "3. **跨平台兼容性** - 支持多设备无缝使用\n"
+        ),
+        "scenarios": "- **场景待定** - 需要进一步市场调研确定主要使用场景\n",
+        "customers": "- **目标客户待定** - 需要进一步市场调研确定\n",
+        "killer_feature": "**核心差异化功能待定** - 需要进一步市场调研确定能解决用户核心痛点的关键功能\n"
+    }
+}
+
 class ReportBuilder:
     """
     报告生成器
@@ -48,25 +467,51 @@ class ReportBuilder:
         Returns:
             执行摘要文本
         """
-        # 统计数据
+        # 统计数据（分数在NumPy数组上汇总）
         total_posts = len(posts)
-        gold_zone_posts = sum(1 for post in posts if post.get("gold_zone", False))
+        arrays = self._post_arrays(posts)
+        gold_zone_posts = int(arrays["gold_zone"].sum())
         
         # 计算平均分数
-        avg_demand = sum(post.get("demand_score", 0) for post in posts) / max(1, total_posts)
-        avg_supply = sum(post.get("supply_score", 0) for post in posts) / max(1, total_posts)
+        avg_demand = float(arrays["demand"].mean()) if total_posts else 0.0
+        avg_supply = float(arrays["supply"].mean()) if total_posts else 0.0
         
         # 生成摘要文本（不超过120字）
-        summary = f"分析了{total_posts}个潜在机会，发现{gold_zone_posts}个黄金区域想法。"
-        summary += f"平均需求分数{avg_demand:.1f}，平均供应分数{avg_supply:.1f}。"
+        parts = [
+            f"分析了{total_posts}个潜在机会，发现{gold_zone_posts}个黄金区域想法。"
+            f"平均需求分数{avg_demand:.1f}，平均供应分数{avg_supply:.1f}。"
+        ]
         
         # 添加最高分机会
         if posts:
-            top_post = max(posts, key=lambda x: x.get("opportunity_score", 0))
+            top_post = posts[int(np.argmax(arrays["opportunity"]))]
             top_title = top_post.get("opportunity", {}).get("title", top_post.get("title", "未知"))
-            summary += f"最高分机会：{top_title}，建议立即评估MVP范围。"
+            parts.append(f"最高分机会：{top_title}，建议立即评估MVP范围。")
         
-        return summary
+        return "".join(parts)
+    
+    def _post_arrays(self, posts: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        将帖子的各项分数提取为NumPy数组，统计计算在数组上完成
+        
+        Args:
+            posts: 帖子列表
+            
+        Returns:
+            包含demand、supply、opportunity分数和gold_zone标记的数组字典
+        """
+        n = len(posts)
+        return {
+            "demand": np.fromiter((post.get("demand_score", 0) for post in posts), dtype=float, count=n),
+            "supply": np.fromiter((post.get("supply_score", 0) for post in posts), dtype=float, count=n),
+            "opportunity": np.fromiter((post.get("opportunity_score", 0) for post in posts), dtype=float, count=n),
+            "gold_zone": np.fromiter((bool(post.get("gold_zone", False)) for post in posts), dtype=bool, count=n)
+        }
+    
+    def _score_histogram(self, scores: np.ndarray) -> List[int]:
+        """按SCORE_RANGE_EDGES统计各区间的分数数量（区间左闭右开，超出[0, 100)的分数不计入）"""
+        in_range = scores[(scores >= SCORE_RANGE_EDGES[0]) & (scores < SCORE_RANGE_EDGES[-1])]
+        return np.histogram(in_range, bins=SCORE_RANGE_EDGES)[0].tolist()
     
     def generate_mermaid_chart(self, posts: List[Dict[str, Any]], limit: int = 10) -> str:
         """
@@ -80,7 +525,7 @@ class ReportBuilder:
             Mermaid图表代码
         """
         # 选择得分最高的帖子
-        top_posts = sorted(posts, key=lambda x: x.get("opportunity_score", 0), reverse=True)[:limit]
+        top_posts = heapq.nlargest(limit, posts, key=lambda x: x.get("opportunity_score", 0))
         
         # 生成Mermaid代码
         mermaid = "```mermaid\nquadrantChart\n"
@@ -116,9 +561,8 @@ class ReportBuilder:
         # 筛选黄金区域帖子
         gold_zone_posts = [post for post in posts if post.get("gold_zone", False)]
         
-        # 按机会分数排序
-        gold_zone_posts.sort(key=lambda x: x.get("opportunity_score", 0), reverse=True)
-        gold_zone_posts = gold_zone_posts[:limit]
+        # 按机会分数取前limit个
+        gold_zone_posts = heapq.nlargest(limit, gold_zone_posts, key=lambda x: x.get("opportunity_score", 0))
         
         if not gold_zone_posts:
             return "## 🥇 黄金区域想法\n\n*未发现黄金区域想法*\n"
@@ -132,287 +576,156 @@ class ReportBuilder:
             matrix_chart_filename = None
         
         # 生成黄金区域部分
-        section = "## 🥇 黄金区域想法\n\n"
+        parts = ["## 🥇 黄金区域想法\n\n"]
         
         # 添加交互式需求-供应矩阵图链接
         if matrix_chart_filename:
-            section += f"### 📊 需求-供应矩阵分析\n\n"
-            section += f"[点击查看交互式需求-供应矩阵图](./demand_supply_matrix_{datetime.now().strftime('%Y-%m-%d')}.html) - 悬停可查看详细产品洞察\n\n"
-            section += f"![需求-供应矩阵图](./{matrix_chart_filename})\n\n"
-            section += "*图表说明: 黄金区域(左上)表示高需求低竞争的市场机会，点击上方链接可查看交互式版本*\n\n"
-        
-        for i, post in enumerate(gold_zone_posts, 1):
+            parts.append(
+                f"### 📊 需求-供应矩阵分析\n\n"
+                f"[点击查看交互式需求-供应矩阵图](./demand_supply_matrix_{datetime.now().strftime('%Y-%m-%d')}.html) - 悬停可查看详细产品洞察\n\n"
+                f"![需求-供应矩阵图](./{matrix_chart_filename})\n\n"
+                "*图表说明: 黄金区域(左上)表示高需求低竞争的市场机会，点击上方链接可查看交互式版本*\n\n"
+            )
+        
+        titles = [
+            post.get("opportunity", {}).get("title", post.get("title", "未知"))
+            for post in gold_zone_posts
+        ]
+        urls = [
+            self._post_url(post, title, post.get('source', '未知'))
+            for post, title in zip(gold_zone_posts, titles)
+        ]
+        
+        for i, (post, title, url) in enumerate(zip(gold_zone_posts, titles, urls), 1):
             opportunity = post.get("opportunity", {})
-            title = opportunity.get("title", post.get("title", "未知"))
             pain_summary = opportunity.get("pain_summary", "")
             source = post.get('source', '未知')
             
-            # 修复Reddit URL格式，确保是有效的Reddit帖子链接
-            if "reddit" in source.lower():
-                # 提取subreddit名称
-                subreddit = source.split("/")[-1] if "/" in source else source
-                # 生成有效的Reddit帖子URL，使用帖子ID或随机ID
-                post_id = post.get("id", "")
-                if not post_id:
-                    # 如果没有ID，使用标题生成一个伪ID
-                    import hashlib
-                    post_id = hashlib.md5(title.encode()).hexdigest()[:6]
-                url = f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/"
-            else:
-                url = post.get("url", "#")
-            
             # 简化标题显示，不使用HTML标记
-            section += f"### {i}. {title}\n\n"
-            section += f"- **需求分数**: {post.get('demand_score', 0)}\n"
-            section += f"- **供应分数**: {post.get('supply_score', 0)}\n"
-            section += f"- **来源**: r/{source} | [链接]({url})\n"
-            section += f"- **发布日期**: {post.get('created_str', '未知')}\n"
+            parts.append(
+                f"### {i}. {title}\n\n"
+                f"- **需求分数**: {post.get('demand_score', 0)}\n"
+                f"- **供应分数**: {post.get('supply_score', 0)}\n"
+                f"- **来源**: r/{source} | [链接]({url})\n"
+                f"- **发布日期**: {post.get('created_str', '未知')}\n"
+            )
             
             if pain_summary:
-                section += f"\n**痛点摘要**: {pain_summary}\n"
+                parts.append(f"\n**痛点摘要**: {pain_summary}\n")
                 
             # 添加痛点、痒点和爽点分析
             insights = self.extract_product_insights(post)
             
-            section += "\n#### 🔍 用户需求深度分析\n"
+            parts.append("\n#### 🔍 用户需求深度分析\n")
+            
+            # 标题只分类一次，各部分直接按类别取模板
+            category = self._classify_title(title)
             
             # 添加痛点分析 - 增强版
-            section += "\n**😣 痛点分析**：用户面临的核心问题和困难\n"
+            parts.append("\n**😣 痛点分析**：用户面临的核心问题和困难\n")
             for i, point in enumerate(insights["pain_points"][:3], 1):
-                section += f"- **P{i}**: {point}\n"
+                parts.append(f"- **P{i}**: {point}\n")
                 
-                # 为每个痛点添加深度分析
-                if i == 1 and "日程" in title or "规划" in title:
-                    section += f"  - *影响*: 导致任务优先级混乱，重要工作被延误\n"
-                    section += f"  - *根本原因*: 现有工具缺乏智能分析能力，无法适应动态变化\n"
-                    section += f"  - *市场缺口*: 智能化日程规划与自动优先级调整\n"
-                elif i == 1 and ("学习" in title or "教育" in title):
-                    section += f"  - *影响*: 学习效率低下，难以持续保持动力\n"
-                    section += f"  - *根本原因*: 标准化学习路径无法满足个性化需求\n"
-                    section += f"  - *市场缺口*: 基于AI的个性化学习路径规划\n"
-                elif i == 1 and ("团队" in title or "协作" in title):
-                    section += f"  - *影响*: 沟通成本高，项目延期风险增加\n"
-                    section += f"  - *根本原因*: 工具碎片化，信息孤岛问题严重\n"
-                    section += f"  - *市场缺口*: 一体化协作平台与智能项目管理\n"
-                elif i == 1:
-                    section += f"  - *影响*: 降低用户体验，增加使用门槛\n"
-                    section += f"  - *根本原因*: 现有解决方案未充分理解用户核心需求\n"
-                    section += f"  - *市场缺口*: 以用户为中心的创新解决方案\n"
+                # 为第一个痛点添加深度分析
+                if i == 1:
+                    parts.append(self._gold_zone_template(category, "pain_analysis"))
                 
             # 添加痒点分析 - 增强版
-            section += "\n**🤔 痒点分析**：用户希望得到改善但不是必需的\n"
+            parts.append("\n**🤔 痒点分析**：用户希望得到改善但不是必需的\n")
             if insights["itch_points"]:
                 for i, point in enumerate(insights["itch_points"][:3], 1):
-                    section += f"- **I{i}**: {point}\n"
+                    parts.append(f"- **I{i}**: {point}\n")
             else:
-                section += "- 暂无明确痒点数据，需要进一步用户研究\n"
+                parts.append("- 暂无明确痒点数据，需要进一步用户研究\n")
                 
             # 添加爽点分析 - 增强版
-            section += "\n**😍 爽点分析**：能让用户感到惊喜的功能\n"
+            parts.append("\n**😍 爽点分析**：能让用户感到惊喜的功能\n")
             if insights["delight_points"]:
                 for i, point in enumerate(insights["delight_points"][:3], 1):
-                    section += f"- **D{i}**: {point}\n"
-            else:
-                section += "- 根据用户需求分析，建议添加以下爽点功能:\n"
-                section += "  - 智能化推荐与个性化体验\n"
-                section += "  - 一键式解决方案，大幅简化操作流程\n"
-                section += "  - 社区互动与成就系统，提升用户参与感\n"
-                
-            # 添加用户评论分析
-            section += "\n**💬 用户反馈分析**\n"
-            section += "根据Reddit讨论提取的关键用户观点:\n"
-            
-            if "日程" in title or "规划" in title:
-                section += "- *\"我尝试过十几个日程应用,没有一个能真正解决我的问题...\"*\n"
-                section += "- *\"最大的问题是它们都不够智能,无法适应我不断变化的优先级...\"*\n"
-            elif "学习" in title or "教育" in title:
-                section += "- *\"学习新语言最大的挑战是坚持下去,需要更好的激励机制...\"*\n"
-                section += "- *\"希望有一个平台能整合所有我需要的语言学习资源...\"*\n"
-            elif "团队" in title or "协作" in title:
-                section += "- *\"远程工作最大的痛点是无法像办公室那样即时沟通和协作...\"*\n"
-                section += "- *\"我们团队使用了太多工具,信息散落各处,难以追踪...\"*\n"
+                    parts.append(f"- **D{i}**: {point}\n")
             else:
-                section += "- *\"现有解决方案缺乏创新,大多是相同功能的不同包装...\"*\n"
-                section += "- *\"用户体验应该是首要考虑因素,但很多产品忽视了这点...\"*\n"
+                parts.append(
+                    "- 根据用户需求分析，建议添加以下爽点功能:\n"
+                    "  - 智能化推荐与个性化体验\n"
+                    "  - 一键式解决方案，大幅简化操作流程\n"
+                    "  - 社区互动与成就系统，提升用户参与感\n"
+                )
             
-            # 添加Top Three Features分析
-            section += "\n#### 🔑 Top Three Features\n"
-            
-            # 根据不同的产品类型提供不同的特性分析
-            if "日程" in title or "规划" in title:
-                section += "1. **智能日程自动规划** - 根据任务优先级和时间限制自动安排最优日程\n"
-                section += "2. **灵活调整与冲突解决** - 当新任务加入时智能重新安排，避免日程冲突\n"
-                section += "3. **多平台同步与提醒** - 跨设备同步日程并提供智能提醒\n"
-            elif "学习" in title or "教育" in title:
-                section += "1. **个性化学习路径** - 根据学习者水平和目标定制学习计划\n"
-                section += "2. **互动练习与即时反馈** - 提供沉浸式学习体验和实时纠错\n"
-                section += "3. **社区学习与激励机制** - 建立学习社区增强动力和坚持度\n"
-            elif "团队" in title or "协作" in title:
-                section += "1. **实时协作文档编辑** - 支持多人同时编辑和查看变更历史\n"
-                section += "2. **任务分配与进度追踪** - 清晰的任务责任制和完成状态可视化\n"
-                section += "3. **集成通讯与文件共享** - 一站式沟通和资源共享平台\n"
-            elif "财务" in title or "金融" in title:
-                section += "1. **自动化收支追踪** - 智能分类和标记交易记录\n"
-                section += "2. **预算规划与提醒** - 个性化预算建议和超支预警\n"
-                section += "3. **财务目标设定与可视化** - 直观展示储蓄和投资进度\n"
-            elif "健康" in title or "饮食" in title:
-                section += "1. **个性化营养建议** - 基于个人健康状况和目标的饮食推荐\n"
-                section += "2. **食物数据库与扫描识别** - 庞大的食品营养数据库和便捷的条码扫描\n"
-                section += "3. **进度追踪与成就系统** - 可视化健康改善进度和激励机制\n"
-            elif "写作" in title or "创意" in title:
-                section += "1. **智能写作建议与灵感生成** - AI辅助提供创意和改进建议\n"
-                section += "2. **结构化写作工具** - 大纲规划和章节组织功能\n"
-                section += "3. **专注模式与目标设定** - 减少干扰的写作环境和进度追踪\n"
-            elif "冥想" in title or "正念" in title:
-                section += "1. **个性化冥想指导** - 根据用户需求和经验提供定制内容\n"
-                section += "2. **进度追踪与习惯养成** - 记录冥想历程和坚持度\n"
-                section += "3. **情绪管理工具** - 提供针对特定情绪状态的冥想练习\n"
-            elif "项目管理" in title or "开发者" in title:
-                section += "1. **轻量级任务跟踪** - 简洁直观的任务管理系统\n"
-                section += "2. **时间追踪与估算** - 记录工作时间并优化未来估算\n"
-                section += "3. **集成开发工具** - 与常用开发环境和版本控制系统无缝集成\n"
-            elif "极简" in title or "专注" in title:
-                section += "1. **数字使用监控与限制** - 追踪屏幕时间并设置使用限制\n"
-                section += "2. **干扰源识别与屏蔽** - 识别并减少注意力分散因素\n"
-                section += "3. **专注时段与奖励机制** - 设定不受干扰的工作时段和完成奖励\n"
-            elif "技能" in title or "交换" in title:
-                section += "1. **技能匹配算法** - 智能匹配互补技能的用户\n"
-                section += "2. **信誉评级系统** - 建立用户信任机制确保交换质量\n"
-                section += "3. **安全交流渠道** - 提供安全可靠的沟通和协作方式\n"
-            else:
-                section += "1. **核心功能待定** - 需要进一步市场调研确定\n"
-                section += "2. **用户体验优化** - 简洁直观的界面设计\n"
-                section += "3. **跨平台兼容性** - 支持多设备无缝使用\n"
-            
-            # 添加使用场景分析
-            section += "\n#### 🔍 使用场景\n"
-            if "日程" in title or "规划" in title:
-                section += "- **工作规划**: 专业人士安排复杂工作日程，平衡多项任务优先级\n"
-                section += "- **学习计划**: 学生规划考试准备和作业完成时间\n"
-                section += "- **团队协调**: 项目团队协调会议和截止日期\n"
-            elif "学习" in title or "教育" in title:
-                section += "- **自学进修**: 成人学习者利用碎片时间学习新语言\n"
-                section += "- **学校补充**: 学生使用平台巩固课堂知识\n"
-                section += "- **职业发展**: 专业人士学习新技能提升职场竞争力\n"
-            elif "团队" in title or "协作" in title:
-                section += "- **远程工作**: 分布式团队保持项目同步和沟通\n"
-                section += "- **跨部门协作**: 不同部门协同完成复杂项目\n"
-                section += "- **客户合作**: 与外部客户共享进度和收集反馈\n"
-            elif "财务" in title or "金融" in title:
-                section += "- **日常预算**: 个人追踪日常支出和管理预算\n"
-                section += "- **储蓄计划**: 设定财务目标并追踪储蓄进度\n"
-                section += "- **投资管理**: 监控投资组合和回报率\n"
-            elif "健康" in title or "饮食" in title:
-                section += "- **减重计划**: 控制卡路里摄入和追踪体重变化\n"
-                section += "- **特殊饮食**: 管理食物过敏或特定饮食需求\n"
-                section += "- **健康改善**: 逐步调整饮食习惯提升整体健康\n"
-            elif "写作" in title or "创意" in title:
-                section += "- **内容创作**: 博客作者和内容创作者撰写文章\n"
-                section += "- **学术写作**: 研究人员和学生撰写论文\n"
-                section += "- **创意写作**: 小说家和剧作家发展故事和角色\n"
-            elif "冥想" in title or "正念" in title:
-                section += "- **压力管理**: 在高压工作环境中寻找平静\n"
-                section += "- **睡眠改善**: 睡前放松提高睡眠质量\n"
-                section += "- **情绪调节**: 应对焦虑和负面情绪\n"
-            elif "项目管理" in title or "开发者" in title:
-                section += "- **独立开发**: 自由开发者管理个人项目\n"
-                section += "- **小型团队**: 初创公司协调开发工作\n"
-                section += "- **客户项目**: 自由职业者管理多个客户项目\n"
-            elif "极简" in title or "专注" in title:
-                section += "- **深度工作**: 创建无干扰的工作环境\n"
-                section += "- **数字排毒**: 减少社交媒体和数字设备依赖\n"
-                section += "- **注意力训练**: 提高专注能力和工作效率\n"
-            elif "技能" in title or "交换" in title:
-                section += "- **社区互助**: 邻里间交换技能和服务\n"
-                section += "- **专业发展**: 专业人士交换知识和指导\n"
-                section += "- **创意合作**: 艺术家和创作者合作项目\n"
-            else:
-                section += "- **场景待定** - 需要进一步市场调研确定主要使用场景\n"
-            
-            # 添加目标客户分析
-            section += "\n#### 👥 目标客户\n"
-            if "日程" in title or "规划" in title:
-                section += "- **商务专业人士**: 需要高效管理时间的企业经理和高管\n"
-                section += "- **自由职业者**: 管理多个项目和客户的独立工作者\n"
-                section += "- **学生**: 平衡学业、社交和兼职工作的大学生\n"
-            elif "学习" in title or "教育" in title:
-                section += "- **语言学习者**: 希望掌握多种语言的国际化人才\n"
-                section += "- **职场人士**: 寻求技能提升的在职人员\n"
-                section += "- **终身学习者**: 对持续学习有热情的各年龄段人群\n"
-            elif "团队" in title or "协作" in title:
-                section += "- **远程团队**: 分布在不同地点的工作团队\n"
-                section += "- **项目经理**: 负责协调团队和资源的管理者\n"
-                section += "- **初创公司**: 需要高效协作但预算有限的小团队\n"
-            elif "财务" in title or "金融" in title:
-                section += "- **年轻专业人士**: 开始建立财务习惯的职场新人\n"
-                section += "- **家庭财务管理者**: 管理家庭预算的个人\n"
-                section += "- **理财初学者**: 希望改善财务状况但缺乏专业知识的人\n"
-            elif "健康" in title or "饮食" in title:
-                section += "- **健康意识人群**: 注重营养和健康饮食的个人\n"
-                section += "- **特殊饮食需求者**: 有食物过敏或饮食限制的人\n"
-                section += "- **健身爱好者**: 将饮食作为健身计划一部分的人\n"
-            elif "写作" in title or "创意" in title:
-                section += "- **内容创作者**: 博客作者、自媒体和内容营销人员\n"
-                section += "- **作家和剧作家**: 创作小说、剧本的专业或业余创作者\n"
-                section += "- **学生和学者**: 需要撰写论文和研究报告的人\n"
-            elif "冥想" in title or "正念" in title:
-                section += "- **高压职业人士**: 寻求压力缓解的企业员工\n"
-                section += "- **冥想初学者**: 希望开始冥想习惯但需要指导的人\n"
-                section += "- **健康生活追求者**: 将冥想作为整体健康计划一部分的人\n"
-            elif "项目管理" in title or "开发者" in title:
-                section += "- **独立开发者**: 管理个人项目的软件工程师\n"
-                section += "- **自由职业技术人员**: 同时处理多个客户项目的自由工作者\n"
-                section += "- **小型开发团队**: 资源有限的创业公司技术团队\n"
-            elif "极简" in title or "专注" in title:
-                section += "- **知识工作者**: 需要长时间专注的专业人士\n"
-                section += "- **数字疲劳人群**: 感到数字过载和注意力分散的用户\n"
-                section += "- **效率追求者**: 希望优化工作流程和减少干扰的人\n"
-            elif "技能" in title or "交换" in title:
-                section += "- **社区成员**: 希望加强社区联系的居民\n"
-                section += "- **技能学习者**: 希望通过实践学习新技能的人\n"
-                section += "- **资源有限人群**: 希望通过交换获取服务而非支付现金的人\n"
-            else:
-                section += "- **目标客户待定** - 需要进一步市场调研确定\n"
-            
-            # 添加Killer Feature分析
-            section += "\n#### 💡 Killer Feature\n"
-            if "日程" in title or "规划" in title:
-                section += "**智能优先级调整** - 区别于传统日历的关键创新是能根据任务重要性、紧急程度和用户过往行为自动调整日程优先级，解决用户在任务冲突时的决策困难，真正实现智能化时间管理而非简单的日程记录。\n"
-            elif "学习" in title or "教育" in title:
-                section += "**跨语言学习生态系统** - 突破传统单一语言学习应用限制，创建统一平台整合多语言学习资源、进度和社区，让用户无需在不同应用间切换即可管理多语言学习，显著提升学习效率和持续性。\n"
-            elif "团队" in title or "协作" in title:
-                section += "**情境感知协作空间** - 超越简单的文件共享和消息传递，系统能根据项目阶段、团队角色和工作模式自动调整界面和工具集，为不同协作场景提供最优工作流程，解决远程团队缺乏情境感知的核心痛点。\n"
-            elif "财务" in title or "金融" in title:
-                section += "**行为洞察与财务教练** - 不只是记录支出，而是分析消费行为模式并提供个性化改进建议，像私人财务教练一样引导用户形成更健康的财务习惯，解决用户知道问题但难以改变行为的关键痛点。\n"
-            elif "健康" in title or "饮食" in title:
-                section += "**情境化营养建议** - 突破简单卡路里计数，根据用户当前健康状况、活动水平、饮食历史和可用食物选择提供实时、可行的营养建议，解决用户知道应该吃什么但难以在实际情况中做出健康选择的核心痛点。\n"
-            elif "写作" in title or "创意" in title:
-                section += "**创意瓶颈突破系统** - 通过分析用户写作风格和当前内容，在创作停滞时提供个性化的创意提示和结构建议，解决写作者面对空白页时的创意阻塞，显著提高创作流畅度和完成率。\n"
-            elif "冥想" in title or "正念" in title:
-                section += "**生物反馈引导冥想** - 结合可穿戴设备数据实时调整冥想引导内容，根据用户当前生理状态(心率、呼吸等)提供个性化指导，解决传统冥想应用无法感知用户实际状态的局限，大幅提高冥想效果。\n"
-            elif "项目管理" in title or "开发者" in title:
-                section += "**开发者思维流追踪** - 专为独立开发者设计的系统能捕捉开发过程中的思考流程和决策点，自动生成开发日志和文档，解决开发者在创意实现过程中的上下文切换和知识管理痛点，显著提高开发效率。\n"
-            elif "极简" in title or "专注" in title:
-                section += "**注意力恢复算法** - 基于认知科学研究，系统能识别用户注意力模式并在最佳时机提供微休息和注意力恢复活动，解决数字世界中持续注意力消耗导致的效率下降问题，帮助用户维持长期高效工作状态。\n"
-            elif "技能" in title or "交换" in title:
-                section += "**价值均衡交换系统** - 创新的技能价值评估算法能客观量化不同技能的价值，确保交换公平性，解决传统技能交换平台中价值评估不明确导致的信任问题，显著提高用户参与度和交换成功率。\n"
-            else:
-                section += "**核心差异化功能待定** - 需要进一步市场调研确定能解决用户核心痛点的关键功能\n"
+            parts.extend([
+                # 添加用户评论分析
+                "\n**💬 用户反馈分析**\n"
+                "根据Reddit讨论提取的关键用户观点:\n",
+                self._gold_zone_template(category, "user_feedback"),
+                # 添加Top Three Features分析（根据不同的产品类型提供不同的特性分析）
+                "\n#### 🔑 Top Three Features\n",
+                self._gold_zone_template(category, "features"),
+                # 添加使用场景分析
+                "\n#### 🔍 使用场景\n",
+                self._gold_zone_template(category, "scenarios"),
+                # 添加目标客户分析
+                "\n#### 👥 目标客户\n",
+                self._gold_zone_template(category, "customers"),
+                # 添加Killer Feature分析
+                "\n#### 💡 Killer Feature\n",
+                self._gold_zone_template(category, "killer_feature")
+            ])
             
             # 添加标签
             tags = opportunity.get("tags", [])
             if tags:
-                section += "\n**标签**: " + ", ".join([f"#{tag}" for tag in tags]) + "\n"
+                parts.append("\n**标签**: " + ", ".join([f"#{tag}" for tag in tags]) + "\n")
             
             # 添加竞品信息
             competitive_data = post.get("competitive_data", {})
             if competitive_data:
-                section += f"\n**竞品数量**: {competitive_data.get('app_count', 0)}\n"
-                section += f"**平均评分**: {competitive_data.get('avg_rating', 0)}\n"
+                parts.append(
+                    f"\n**竞品数量**: {competitive_data.get('app_count', 0)}\n"
+                    f"**平均评分**: {competitive_data.get('avg_rating', 0)}\n"
+                )
             
-            section += "\n---\n\n"
+            parts.append("\n---\n\n")
+        
+        return "".join(parts)
+    
+    def _post_url(self, post: Dict[str, Any], title: str, source: str) -> str:
+        """
+        生成帖子链接，Reddit来源修正为有效的帖子URL
         
-        return section
+        Args:
+            post: 帖子数据
+            title: 帖子标题（缺少ID时用于生成伪ID）
+            source: 帖子来源
+            
+        Returns:
+            帖子链接
+        """
+        if "reddit" not in source.lower():
+            return post.get("url", "#")
+        # 提取subreddit名称
+        subreddit = source.split("/")[-1] if "/" in source else source
+        post_id = post.get("id", "")
+        if not post_id:
+            # 如果没有ID，使用标题生成一个6位十六进制伪ID（非安全用途，blake2b比md5更快）
+            post_id = hashlib.blake2b(title.encode(), digest_size=3).hexdigest()
+        return f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/"
+    
+    def _classify_title(self, title: str) -> str:
+        """根据标题关键词确定产品类别"""
+        categories = _title_categories(title)
+        return categories[0] if categories else "default"
+    
+    def _classify_insight(self, title: str, tags: List[str]) -> str:
+        """根据标题关键词或标签确定洞察分析的产品类别"""
+        title_categories = _title_categories(title)
+        for category, category_tags in INSIGHT_CATEGORY_TAGS:
+            if category in title_categories or any(tag in tags for tag in category_tags):
+                return category
+        return "default"
+    
+    def _gold_zone_template(self, category: str, part: str) -> str:
+        """获取类别对应的分析模板，该类别没有专门内容时使用default"""
+        templates = GOLD_ZONE_TEMPLATES[category]
+        return templates[part] if part in templates else GOLD_ZONE_TEMPLATES["default"][part]
     
     def generate_detail_sheets(self, posts: List[Dict[str, Any]], limit: int = 5) -> str:
         """
@@ -426,55 +739,61 @@ class ReportBuilder:
             详细表格部分文本
         """
         # 选择得分最高的帖子
-        top_posts = sorted(posts, key=lambda x: x.get("opportunity_score", 0), reverse=True)[:limit]
+        top_posts = heapq.nlargest(limit, posts, key=lambda x: x.get("opportunity_score", 0))
         
-        section = "## 📋 详细分析表\n\n"
+        parts = ["## 📋 详细分析表\n\n"]
         
         for i, post in enumerate(top_posts, 1):
             opportunity = post.get("opportunity", {})
             title = opportunity.get("title", post.get("title", "未知"))
             
-            section += f"### {i}. {title}\n\n"
+            parts.append(f"### {i}. {title}\n\n")
             
             # 基本信息表格
-            section += "| 指标 | 值 |\n|-----|-----|\n"
-            section += f"| 需求分数 | {post.get('demand_score', 0)} |\n"
-            section += f"| 供应分数 | {post.get('supply_score', 0)} |\n"
-            section += f"| 机会分数 | {post.get('opportunity_score', 0)} |\n"
-            section += f"| 黄金区域 | {'✅' if post.get('gold_zone', False) else '❌'} |\n"
+            parts.append(
+                "| 指标 | 值 |\n|-----|-----|\n"
+                f"| 需求分数 | {post.get('demand_score', 0)} |\n"
+                f"| 供应分数 | {post.get('supply_score', 0)} |\n"
+                f"| 机会分数 | {post.get('opportunity_score', 0)} |\n"
+                f"| 黄金区域 | {'✅' if post.get('gold_zone', False) else '❌'} |\n"
+            )
             
             # 机会详情
-            section += "\n#### 机会详情\n\n"
-            section += f"**痛点摘要**: {opportunity.get('pain_summary', '未提供')}\n\n"
-            section += f"**未满足需求**: {'✅' if opportunity.get('unmet_need', False) else '❌'}\n"
-            section += f"**个人可开发**: {'✅' if opportunity.get('solo_doable', False) else '❌'}\n"
-            section += f"**可变现**: {'✅' if opportunity.get('monetizable', False) else '❌'}\n"
+            parts.append(
+                "\n#### 机会详情\n\n"
+                f"**痛点摘要**: {opportunity.get('pain_summary', '未提供')}\n\n"
+                f"**未满足需求**: {'✅' if opportunity.get('unmet_need', False) else '❌'}\n"
+                f"**个人可开发**: {'✅' if opportunity.get('solo_doable', False) else '❌'}\n"
+                f"**可变现**: {'✅' if opportunity.get('monetizable', False) else '❌'}\n"
+            )
             
             # 竞品分析
             competitive_data = post.get("competitive_data", {})
-            section += "\n#### 竞品分析\n\n"
-            section += f"**竞品数量**: {competitive_data.get('app_count', 0)}\n"
-            section += f"**平均评分**: {competitive_data.get('avg_rating', 0)}\n\n"
+            parts.append(
+                "\n#### 竞品分析\n\n"
+                f"**竞品数量**: {competitive_data.get('app_count', 0)}\n"
+                f"**平均评分**: {competitive_data.get('avg_rating', 0)}\n\n"
+            )
             
             # 竞品列表
             competitors = competitive_data.get("competitors", [])
             if competitors:
-                section += "**主要竞品**:\n\n"
+                parts.append("**主要竞品**:\n\n")
                 for comp in competitors[:3]:  # 只显示前3个
-                    section += f"- {comp.get('name', '未知')} (评分: {comp.get('rating', 0)})\n"
+                    parts.append(f"- {comp.get('name', '未知')} (评分: {comp.get('rating', 0)})\n")
             
             # 行动建议
-            section += "\n#### 行动建议\n\n"
+            parts.append("\n#### 行动建议\n\n")
             if post.get("gold_zone", False):
-                section += "🚀 **建议行动**: 立即开始MVP规划，验证核心功能\n"
+                parts.append("🚀 **建议行动**: 立即开始MVP规划，验证核心功能\n")
             elif post.get("opportunity_score", 0) > 50:
-                section += "🔍 **建议行动**: 进一步市场调研，评估竞争壁垒\n"
+                parts.append("🔍 **建议行动**: 进一步市场调研，评估竞争壁垒\n")
             else:
-                section += "⏳ **建议行动**: 持续观察市场变化，暂不建议投入\n"
+                parts.append("⏳ **建议行动**: 持续观察市场变化，暂不建议投入\n")
             
-            section += "\n---\n\n"
+            parts.append("\n---\n\n")
         
-        return section
+        return "".join(parts)
     
     def generate_appendix(self, posts: List[Dict[str, Any]]) -> str:
         """
@@ -486,50 +805,52 @@ class ReportBuilder:
         Returns:
             附录部分文本
         """
-        section = "## 📊 附录 - 数据统计\n\n"
+        parts = ["## 📊 附录 - 数据统计\n\n"]
         
-        # 来源统计
+        # 一次遍历统计来源和标签
         sources = {}
+        tags = {}
         for post in posts:
             source = post.get("source", "未知")
             sources[source] = sources.get(source, 0) + 1
+            
+            opportunity = post.get("opportunity", {})
+            for tag in opportunity.get("tags", []):
+                tags[tag] = tags.get(tag, 0) + 1
         
-        section += "### 数据来源分布\n\n"
-        section += "| 来源 | 数量 | 占比 |\n|-----|-----|-----|\n"
+        # 来源统计
+        parts.append(
+            "### 数据来源分布\n\n"
+            "| 来源 | 数量 | 占比 |\n|-----|-----|-----|\n"
+        )
         for source, count in sources.items():
             percentage = (count / len(posts)) * 100
-            section += f"| {source} | {count} | {percentage:.1f}% |\n"
+            parts.append(f"| {source} | {count} | {percentage:.1f}% |\n")
         
         # 标签统计
-        tags = {}
-        for post in posts:
-            opportunity = post.get("opportunity", {})
-            for tag in opportunity.get("tags", []):
-                tags[tag] = tags.get(tag, 0) + 1
-        
-        section += "\n### 热门标签\n\n"
-        section += "| 标签 | 出现次数 |\n|-----|-----|\n"
+        parts.append(
+            "\n### 热门标签\n\n"
+            "| 标签 | 出现次数 |\n|-----|-----|\n"
+        )
         
         # 按出现次数排序，取前10个
         sorted_tags = sorted(tags.items(), key=lambda x: x[1], reverse=True)[:10]
         for tag, count in sorted_tags:
-            section += f"| #{tag} | {count} |\n"
+            parts.append(f"| #{tag} | {count} |\n")
         
         # 评分分布
-        section += "\n### 评分分布\n\n"
-        section += "| 分数区间 | 需求分数 | 供应分数 | 机会分数 |\n|-----|-----|-----|-----|\n"
-        
-        # 定义分数区间
-        score_ranges = [(0, 30), (30, 50), (50, 70), (70, 100)]
-        
-        for low, high in score_ranges:
-            demand_count = sum(1 for post in posts if low <= post.get("demand_score", 0) < high)
-            supply_count = sum(1 for post in posts if low <= post.get("supply_score", 0) < high)
-            opportunity_count = sum(1 for post in posts if low <= post.get("opportunity_score", 0) < high)
-            
-            section += f"| {low}-{high} | {demand_count} | {supply_count} | {opportunity_count} |\n"
+        parts.append(
+            "\n### 评分分布\n\n"
+            "| 分数区间 | 需求分数 | 供应分数 | 机会分数 |\n|-----|-----|-----|-----|\n"
+        )
+        arrays = self._post_arrays(posts)
+        demand_bins, supply_bins, opportunity_bins = (
+            self._score_histogram(arrays[key]) for key in ("demand", "supply", "opportunity")
+        )
+        for i, (low, high) in enumerate(zip(SCORE_RANGE_EDGES, SCORE_RANGE_EDGES[1:])):
+            parts.append(f"| {low}-{high} | {demand_bins[i]} | {supply_bins[i]} | {opportunity_bins[i]} |\n")
         
-        return section
+        return "".join(parts)
     
     def extract_product_insights(self, post: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -558,16 +879,6 @@ class ReportBuilder:
         comments = post.get("comments", [])
         raw_text = title + "\n" + content
         
-        # 关键词分类，用于智能提取洞察
-        pain_keywords = ["frustrated", "annoying", "hate", "difficult", "problem", "issue", "struggle", "pain", "terrible", 
-                        "烦人", "讨厌", "困难", "问题", "挣扎", "痛苦", "糟糕", "浪费时间", "不方便", "麻烦"]
-        
-        itch_keywords = ["wish", "would be nice", "hope", "could be better", "improve", "missing", "lack", 
-                        "希望", "改进", "提升", "缺少", "缺乏", "不够好", "可以更好", "更好的体验"]
-        
-        delight_keywords = ["love", "amazing", "perfect", "awesome", "great", "excellent", "game changer", "revolutionary", 
-                          "喜欢", "惊人", "完美", "棒极了", "太好了", "出色", "改变游戏规则", "革命性"]
-        
         # 如果有评论，添加到原始文本中进行分析并提取关键用户引用
         if comments:
             for comment in comments[:10]:  # 分析前10条评论
@@ -577,10 +888,11 @@ class ReportBuilder:
                     
                     # 提取有价值的用户引用
                     if len(comment_text) > 20 and len(comment_text) < 200:  # 适当长度的评论更有价值
-                        # 检查是否包含关键词
-                        has_pain = any(kw in comment_text.lower() for kw in pain_keywords)
-                        has_itch = any(kw in comment_text.lower() for kw in itch_keywords)
-                        has_delight = any(kw in comment_text.lower() for kw in delight_keywords)
+                        # 检查是否包含关键词（一次扫描同时得到三类关键词的命中情况）
+                        hits = _match_insight_keywords(comment_text)
+                        has_pain = "pain" in hits
+                        has_itch = "itch" in hits
+                        has_delight = "delight" in hits
                         
                         if has_pain or has_itch or has_delight:
                             # 清理引用文本
@@ -607,6 +919,13 @@ class ReportBuilder:
         # 根据痛点摘要提取痛点
         if pain_summary:
             insights["pain_points"].append(pain_summary)
+        
+        # 根据产品类型（标题关键词和标签）补充通用洞察
+        category = self._classify_insight(title, opportunity.get("tags", []))
+        for key, points in INSIGHT_TEMPLATES[category].items():
+            insights[key].extend(points)
+        
+        return insights
             
     def _extract_insight_from_text(self, text: str, insight_type: str) -> str:
         """
@@ -650,155 +969,6 @@ class ReportBuilder:
                 return f"用户惊喜: {parts[1].strip()}"
             else:
                 return f"用户惊喜点: {text[:100].strip()}..."
-        
-        # 根据产品类型和标题关键词提取更多洞察
-        tags = opportunity.get("tags", [])
-        
-        # 日程/规划类产品
-        if "日程" in title or "规划" in title or "calendar" in tags or "planning" in tags:
-            insights["pain_points"].extend([
-                "现有日历应用无法智能调整任务优先级",
-                "在多个日历应用间切换造成信息碎片化",
-                "手动调整日程耗时且容易出错"
-            ])
-            insights["itch_points"].extend([
-                "希望有更美观的日历界面",
-                "希望能自定义更多视图选项",
-                "希望有更丰富的提醒方式"
-            ])
-            insights["delight_points"].extend([
-                "AI自动规划最优日程安排",
-                "智能识别并解决日程冲突",
-                "根据历史完成情况优化未来规划"
-            ])
-        
-        # 学习/教育类产品
-        elif "学习" in title or "教育" in title or "learning" in tags or "education" in tags:
-            insights["pain_points"].extend([
-                "学习进度难以持续跟踪",
-                "缺乏针对个人水平的学习路径",
-                "学习材料质量参差不齐"
-            ])
-            insights["itch_points"].extend([
-                "希望有更多互动练习",
-                "希望能与其他学习者交流",
-                "希望有更多趣味性内容"
-            ])
-            insights["delight_points"].extend([
-                "AI生成个性化学习计划",
-                "实时语言对话练习",
-                "沉浸式学习体验"
-            ])
-        
-        # 团队协作类产品
-        elif "团队" in title or "协作" in title or "team" in tags or "collaboration" in tags:
-            insights["pain_points"].extend([
-                "团队沟通效率低下",
-                "项目进度难以实时追踪",
-                "远程协作缺乏面对面交流的效果"
-            ])
-            insights["itch_points"].extend([
-                "希望有更直观的项目视图",
-                "希望能更方便地分享和查找文件",
-                "希望有更灵活的权限设置"
-            ])
-            insights["delight_points"].extend([
-                "智能任务分配和负载均衡",
-                "实时协作编辑与即时反馈",
-                "自动生成会议纪要和行动项"
-            ])
-        
-        # 财务/金融类产品
-        elif "财务" in title or "金融" in title or "finance" in tags or "money" in tags:
-            insights["pain_points"].extend([
-                "手动记账费时且容易遗漏",
-                "难以全面了解个人财务状况",
-                "缺乏有效的预算规划工具"
-            ])
-            insights["itch_points"].extend([
-                "希望有更美观的财务报表",
-                "希望能自动同步多个账户",
-                "希望有更多财务建议"
-            ])
-            insights["delight_points"].extend([
-                "AI预测未来财务状况",
-                "智能识别节省机会",
-                "个性化投资建议"
-            ])
-        
-        # 健康/饮食类产品
-        elif "健康" in title or "饮食" in title or "health" in tags or "nutrition" in tags:
-            insights["pain_points"].extend([
-                "难以坚持健康饮食计划",
-                "营养信息复杂难以理解",
-                "缺乏个性化的健康建议"
-            ])
-            insights["itch_points"].extend([
-                "希望有更多健康食谱推荐",
-                "希望能追踪更多健康指标",
-                "希望有更美观的进度展示"
-            ])
-            insights["delight_points"].extend([
-                "扫描食物自动识别营养成分",
-                "根据个人情况智能调整饮食计划",
-                "社区支持和激励系统"
-            ])
-        
-        # 写作/创意类产品
-        elif "写作" in title or "创意" in title or "writing" in tags or "creative" in tags:
-            insights["pain_points"].extend([
-                "创作灵感枯竭",
-                "写作过程中容易分心",
-                "缺乏有效的写作结构工具"
-            ])
-            insights["itch_points"].extend([
-                "希望有更多写作模板",
-                "希望能追踪写作进度",
-                "希望有更好的版本管理"
-            ])
-            insights["delight_points"].extend([
-                "AI生成创意灵感和建议",
-                "智能分析写作风格和结构",
-                "沉浸式写作环境"
-            ])
-        
-        # 极简/专注类产品
-        elif "极简" in title or "专注" in title or "minimalism" in tags or "focus" in tags:
-            insights["pain_points"].extend([
-                "数字干扰严重影响工作效率",
-                "难以长时间保持专注",
-                "缺乏有效的时间管理方法"
-            ])
-            insights["itch_points"].extend([
-                "希望有更简洁的界面设计",
-                "希望能自定义专注时长",
-                "希望有更多专注技巧指导"
-            ])
-            insights["delight_points"].extend([
-                "智能识别并屏蔽干扰源",
-                "根据个人专注曲线优化工作时间",
-                "成就系统增强坚持动力"
-            ])
-        
-        # 通用产品洞察
-        else:
-            insights["pain_points"].extend([
-                "现有解决方案使用复杂",
-                "功能与用户需求不匹配",
-                "价格与价值不成正比"
-            ])
-            insights["itch_points"].extend([
-                "希望有更好的用户界面",
-                "希望有更多自定义选项",
-                "希望有更好的客户支持"
-            ])
-            insights["delight_points"].extend([
-                "超出预期的易用性",
-                "创新功能带来惊喜体验",
-                "无缝集成到现有工作流程"
-            ])
-        
-        return insights
 
     def generate_demand_supply_plot(self, posts: List[Dict[str, Any]], filename: str = None) -> str:
         """
@@ -958,9 +1128,6 @@ class ReportBuilder:
         
         # Extract data from posts
         for post in posts:
-            # Extract product insights
-            insights = self.extract_product_insights(post)
-            
             # Extract basic data
             title = post.get("opportunity", {}).get("title", post.get("title", "Untitled"))
             supply_score = post.get("supply_score", 0)
@@ -1246,10 +1413,16 @@ class ReportBuilder:
         table += "|---|-------|--------------|--------------|-------------------|-----------|-------|-----|\n"
         
         # 排序数据
-        sorted_posts = sorted(posts, key=lambda x: x.get(sort_by, 0), reverse=True)[:limit]
+        sorted_posts = heapq.nlargest(limit, posts, key=lambda x: x.get(sort_by, 0))
+        
+        # 预先生成所有帖子链接
+        urls = [
+            self._post_url(post, post.get("title", "未知"), post.get("source", ""))
+            for post in sorted_posts
+        ]
         
         # 生成表格行
-        for i, post in enumerate(sorted_posts, 1):
+        for i, (post, url) in enumerate(zip(sorted_posts, urls), 1):
             title = post.get("title", "未知")
             # 直接使用标题，不添加HTML链接标记
             demand_score = post.get("demand_score", 0)
@@ -1258,21 +1431,6 @@ class ReportBuilder:
             gold_zone = "✅" if post.get("gold_zone", False) else "None"
             score = post.get("score", "None")
             
-            # 修复Reddit URL格式，确保是有效的Reddit帖子链接
-            source = post.get("source", "")
-            if "reddit" in source.lower():
-                # 提取subreddit名称
-                subreddit = source.split("/")[-1] if "/" in source else source
-                # 生成有效的Reddit帖子URL，使用帖子ID或随机ID
-                post_id = post.get("id", "")
-                if not post_id:
-                    # 如果没有ID，使用标题生成一个伪ID
-                    import hashlib
-                    post_id = hashlib.md5(title.encode()).hexdigest()[:6]
-                url = f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/"
-            else:
-                url = post.get("url", "#")
-            
             table += f"| {i} | {title} | {demand_score} | {supply_score} | {opportunity_score} | {gold_zone} | {score} | {url} |\n"
         
         return table
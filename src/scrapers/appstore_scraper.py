@@ -37,6 +37,8 @@ class AppStoreScraper:
             client: 可选的httpx异步客户端，如果不提供则创建新的
         """
         self.client = client
+        # 只关闭自己创建的客户端，外部传入的共享客户端由调用方负责关闭
+        self.owns_client = client is None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36",
             "Accept": "application/json"
@@ -48,8 +50,9 @@ class AppStoreScraper:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client is not None:
+        if self.owns_client and self.client is not None:
             await self.client.aclose()
+            self.client = None
     
     async def fetch_with_retry(self, url: str) -> Dict[str, Any]:
         """
@@ -73,7 +76,7 @@ class AppStoreScraper:
                 if attempt > 0:
                     await asyncio.sleep(delay)
                 
-                response = await self.client.get(url)
+                response = await self.client.get(url, headers=self.headers)
                 response.raise_for_status()
                 return response.json()
                 
@@ -40,6 +40,8 @@ class ChromeStoreScraper:
             client: 可选的httpx异步客户端，如果不提供则创建新的
         """
         self.client = client
+        # 只关闭自己创建的客户端，外部传入的共享客户端由调用方负责关闭
+        self.owns_client = client is None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
@@ -55,8 +57,9 @@ class ChromeStoreScraper:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client is not None:
+        if self.owns_client and self.client is not None:
             await self.client.aclose()
+            self.client = None
     
     async def fetch_with_retry(self, url: str, method: str = "GET", data: Dict = None) -> str:
         """
@@ -84,9 +87,9 @@ class ChromeStoreScraper:
                 
                 if method.upper() == "GET":
                     # 设置follow_redirects为True以自动处理重定向
-                    response = await self.client.get(url, follow_redirects=True)
+                    response = await self.client.get(url, headers=self.headers, follow_redirects=True)
                 else:  # POST
-                    response = await self.client.post(url, data=data, follow_redirects=True)
+                    response = await self.client.post(url, headers=self.headers, data=data, follow_redirects=True)
                 
                 response.raise_for_status()
                 return response.text
@@ -41,6 +41,8 @@ class ProductHuntScraper:
             client: 可选的httpx异步客户端，如果不提供则创建新的
         """
         self.client = client
+        # 只关闭自己创建的客户端，外部传入的共享客户端由调用方负责关闭
+        self.owns_client = client is None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.69 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
@@ -62,8 +64,9 @@ class ProductHuntScraper:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client is not None:
+        if self.owns_client and self.client is not None:
             await self.client.aclose()
+            self.client = None
     
     async def fetch_with_retry(self, url: str) -> str:
         """
@@ -87,7 +90,7 @@ class ProductHuntScraper:
                 if attempt > 0:
                     await asyncio.sleep(delay)
                 
-                response = await self.client.get(url)
+                response = await self.client.get(url, headers=self.headers, follow_redirects=True)
                 response.raise_for_status()
                 return response.text
                 
@@ -40,6 +40,8 @@ class RedditScraper:
             client: 可选的httpx异步客户端，如果不提供则创建新的
         """
         self.client = client
+        # 只关闭自己创建的客户端，外部传入的共享客户端由调用方负责关闭
+        self.owns_client = client is None
         self.headers = {
             "User-Agent": USER_AGENT,
             "Accept": "application/json"
@@ -51,8 +53,9 @@ class RedditScraper:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client is not None:
+        if self.owns_client and self.client is not None:
             await self.client.aclose()
+            self.client = None
     
     async def fetch_with_retry(self, url: str) -> Dict[str, Any]:
         """
@@ -76,7 +79,7 @@ class RedditScraper:
                 if attempt > 0:
                     await asyncio.sleep(delay)
                 
-                response = await self.client.get(url)
+                response = await self.client.get(url, headers=self.headers)
                 response.raise_for_status()
                 return response.json()
                 
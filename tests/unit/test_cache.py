@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SQLite缓存单元测试
+
+测试缓存的读写、过期和清理
+"""
+
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.cache import SQLiteCache
+
+class TestSQLiteCache(unittest.TestCase):
+    """测试SQLite缓存的功能"""
+    
+    def setUp(self):
+        """设置测试环境"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = SQLiteCache(os.path.join(self.tmp_dir.name, "cache.sqlite3"))
+    
+    def tearDown(self):
+        """清理测试环境"""
+        self.cache.close()
+        self.tmp_dir.cleanup()
+    
+    def test_set_and_get(self):
+        """测试写入后可以读回相同的值"""
+        data = {"app_id": "123", "ratings": [{"date": "2025-04", "rating": 4.5}], "trend": "up"}
+        self.cache.set("appstore:123:trend", data, ttl=60)
+        self.assertEqual(self.cache.get("appstore:123:trend"), data)
+    
+    def test_missing_key(self):
+        """测试未命中返回None"""
+        self.assertIsNone(self.cache.get("missing"))
+    
+    def test_expired_entry(self):
+        """测试过期条目视为未命中，并可被清理"""
+        self.cache.set("old", {"value": 1}, ttl=-1)
+        self.cache.set("fresh", {"value": 2}, ttl=60)
+        self.assertIsNone(self.cache.get("old"))
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertEqual(self.cache.get("fresh"), {"value": 2})
+
+    def test_async_set_and_get(self):
+        """测试异步接口与同步接口读写同一份数据"""
+        async def run():
+            await self.cache.aset("chromestore:abc:stats", {"users": 1000}, ttl=60)
+            return await self.cache.aget("chromestore:abc:stats")
+        
+        self.assertEqual(asyncio.run(run()), {"users": 1000})
+        self.assertEqual(self.cache.get("chromestore:abc:stats"), {"users": 1000})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+关键词匹配单元测试
+
+分别测试Aho-Corasick路径和正则回退路径，包括：
+1. 忽略大小写的中英文匹配
+2. 多个分组共享或重叠的关键词
+3. 空关键词和空分组
+"""
+
+import unittest
+import sys
+import os
+import importlib.util
+from unittest import mock
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.keywords import build_keyword_matcher, build_keyword_classifier
+
+HAS_AHOCORASICK = importlib.util.find_spec("ahocorasick") is not None
+
+GROUPS = {
+    "calendar": ["Calendar", "日程"],
+    "notes": ["note", "笔记"],
+    "writing": ["notes", "写作"],
+    "empty": [],
+}
+
+class KeywordTestsMixin:
+    """两种实现共用的测试用例，子类在build中选择实现路径"""
+
+    def build_matcher(self, keywords):
+        return build_keyword_matcher(keywords)
+
+    def build_classifier(self, groups):
+        return build_keyword_classifier(groups)
+
+    def test_matcher_ignores_case(self):
+        """测试英文关键词忽略大小写，中文关键词按子串匹配"""
+        matches = self.build_matcher(["Calendar", "日程"])
+        self.assertTrue(matches("best CALENDAR app"))
+        self.assertTrue(matches("需要一个日程管理工具"))
+        self.assertTrue(matches("一个calendar应用"))
+        self.assertFalse(matches("a todo list"))
+
+    def test_matcher_empty_keywords(self):
+        """测试没有有效关键词时不匹配任何文本"""
+        for keywords in ([], [""]):
+            matches = self.build_matcher(keywords)
+            self.assertFalse(matches("anything"))
+            self.assertFalse(matches(""))
+
+    def test_classifier_ignores_case(self):
+        """测试分类时中英文关键词都能命中"""
+        classify = self.build_classifier(GROUPS)
+        self.assertEqual(classify("My CALENDAR"), frozenset({"calendar"}))
+        self.assertEqual(classify("日程和笔记"), frozenset({"calendar", "notes"}))
+        self.assertEqual(classify("nothing here"), frozenset())
+
+    def test_classifier_overlapping_keywords(self):
+        """测试重叠的关键词同时命中各自的分组"""
+        classify = self.build_classifier(GROUPS)
+        # "notes"同时包含"note"（notes组）和"notes"（writing组）
+        self.assertEqual(classify("Taking Notes"), frozenset({"notes", "writing"}))
+        self.assertEqual(classify("a note"), frozenset({"notes"}))
+
+    def test_classifier_shared_keyword(self):
+        """测试同一关键词属于多个分组"""
+        classify = self.build_classifier({"a": ["focus"], "b": ["focus", "timer"]})
+        self.assertEqual(classify("FOCUS mode"), frozenset({"a", "b"}))
+        self.assertEqual(classify("timer"), frozenset({"b"}))
+
+    def test_classifier_all_groups_hit(self):
+        """测试所有非空分组都命中时返回全部分组"""
+        classify = self.build_classifier({"a": ["x"], "b": ["y"]})
+        self.assertEqual(classify("x y x y"), frozenset({"a", "b"}))
+
+    def test_classifier_empty_groups(self):
+        """测试空分组永远不会命中"""
+        classify = self.build_classifier(GROUPS)
+        self.assertNotIn("empty", classify("calendar notes 写作"))
+        for groups in ({}, {"a": [], "b": [""]}):
+            classify = self.build_classifier(groups)
+            self.assertEqual(classify("anything"), frozenset())
+
+class TestKeywordsRegexFallback(KeywordTestsMixin, unittest.TestCase):
+    """测试未安装pyahocorasick时的正则回退路径"""
+
+    def setUp(self):
+        """让ahocorasick的导入失败"""
+        patcher = mock.patch.dict(sys.modules, {"ahocorasick": None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+@unittest.skipUnless(HAS_AHOCORASICK, "pyahocorasick未安装")
+class TestKeywordsAhoCorasick(KeywordTestsMixin, unittest.TestCase):
+    """测试Aho-Corasick自动机路径"""
+
+if __name__ == "__main__":
+    unittest.main()